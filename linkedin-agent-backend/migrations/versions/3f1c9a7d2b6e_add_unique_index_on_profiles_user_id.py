@@ -0,0 +1,31 @@
+"""add unique index on profiles.user_id
+
+Revision ID: 3f1c9a7d2b6e
+Revises: 
+Create Date: 2026-10-16 10:12:41.503128
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b6e'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Build the index without locking profiles against writes; CONCURRENTLY
+    # can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_user_id "
+            "ON profiles (user_id)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_profiles_user_id")
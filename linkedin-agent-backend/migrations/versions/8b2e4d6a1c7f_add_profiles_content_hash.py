@@ -0,0 +1,24 @@
+"""add profiles.content_hash
+
+Revision ID: 8b2e4d6a1c7f
+Revises: 3f1c9a7d2b6e
+Create Date: 2026-10-16 11:03:27.918440
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6a1c7f'
+down_revision = '3f1c9a7d2b6e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('profiles', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    op.drop_column('profiles', 'content_hash')
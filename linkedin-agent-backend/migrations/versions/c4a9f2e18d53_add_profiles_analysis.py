@@ -0,0 +1,26 @@
+"""add profiles.analysis and profiles.analyzed_at
+
+Revision ID: c4a9f2e18d53
+Revises: 8b2e4d6a1c7f
+Create Date: 2026-10-16 13:41:09.264715
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9f2e18d53'
+down_revision = '8b2e4d6a1c7f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('profiles', sa.Column('analysis', sa.JSON(), nullable=True))
+    op.add_column('profiles', sa.Column('analyzed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('profiles', 'analyzed_at')
+    op.drop_column('profiles', 'analysis')
@@ -82,6 +82,9 @@ if [ ! -f "$CONFIG_DIR/celery.env" ]; then
     read
 else
     echo -e "${YELLOW}Environment file already exists at $CONFIG_DIR/celery.env${NC}"
+    # The units set a per-service metrics directory, which a value in the
+    # environment file would override
+    sed -i '/^PROMETHEUS_MULTIPROC_DIR=/d' "$CONFIG_DIR/celery.env"
 fi
 
 # Fix permissions
@@ -93,6 +96,10 @@ chmod 600 "$CONFIG_DIR/celery.env"
 # Copy systemd service files
 step "Installing systemd service files"
 cp "$INSTALL_DIR/scripts/celery-worker.service" /etc/systemd/system/
+cp "$INSTALL_DIR/scripts/celery-worker-batch.service" /etc/systemd/system/
+cp "$INSTALL_DIR/scripts/celery-worker-llm-fast.service" /etc/systemd/system/
+cp "$INSTALL_DIR/scripts/celery-worker-llm-medium.service" /etc/systemd/system/
+cp "$INSTALL_DIR/scripts/celery-worker-llm-slow.service" /etc/systemd/system/
 cp "$INSTALL_DIR/scripts/celery-beat.service" /etc/systemd/system/
 cp "$INSTALL_DIR/scripts/celery-api.service" /etc/systemd/system/
 systemctl daemon-reload
@@ -106,31 +113,52 @@ export PGPASSWORD
 # Check if database already exists
 if sudo -u postgres psql -lqt | cut -d \| -f 1 | grep -qw linkedin_agent; then
     echo -e "${YELLOW}Database linkedin_agent already exists${NC}"
+    NEW_DATABASE=false
 else
     echo -e "${GREEN}Creating database...${NC}"
     sudo -u postgres psql -c "CREATE DATABASE linkedin_agent;"
     echo -e "${GREEN}Database created successfully${NC}"
+    NEW_DATABASE=true
 fi
 
-# Run database migrations
+# Run database migrations; the revisions only alter existing tables, so a
+# new database gets its tables from the models and every revision stamped
 step "Running database migrations"
 source "$CONFIG_DIR/celery.env"
 cd "$INSTALL_DIR"
 source "$VENV_DIR/bin/activate"
-alembic upgrade head
+if [ "$NEW_DATABASE" = true ]; then
+    python -c "from src.app.db.base import Base; from src.app.db.session import engine; Base.metadata.create_all(engine)"
+    alembic stamp head
+else
+    alembic upgrade head
+fi
+python scripts/optimize_db.py
 
 # Start services
 step "Starting services"
 systemctl start celery-worker.service
+systemctl start celery-worker-batch.service
+systemctl start celery-worker-llm-fast.service
+systemctl start celery-worker-llm-medium.service
+systemctl start celery-worker-llm-slow.service
 systemctl start celery-beat.service
 systemctl start celery-api.service
 systemctl enable celery-worker.service
+systemctl enable celery-worker-batch.service
+systemctl enable celery-worker-llm-fast.service
+systemctl enable celery-worker-llm-medium.service
+systemctl enable celery-worker-llm-slow.service
 systemctl enable celery-beat.service
 systemctl enable celery-api.service
 
 # Check service status
 step "Checking service status"
 systemctl status celery-worker.service --no-pager
+systemctl status celery-worker-batch.service --no-pager
+systemctl status celery-worker-llm-fast.service --no-pager
+systemctl status celery-worker-llm-medium.service --no-pager
+systemctl status celery-worker-llm-slow.service --no-pager
 systemctl status celery-beat.service --no-pager
 systemctl status celery-api.service --no-pager
 
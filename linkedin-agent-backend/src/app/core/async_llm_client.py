@@ -0,0 +1,292 @@
+"""
+Async LLM client for the LinkedIn AI Agent.
+This module provides an asyncio interface to LLM models (Claude/GPT) so that
+independent prompts can be sent concurrently.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from typing import AsyncIterator, Awaitable, Optional, TypeVar
+
+import anthropic
+import openai
+import redis
+from fastapi import HTTPException, status
+
+from src.app.core.cache import get_loop_redis_client
+from src.app.core.config import settings
+from src.app.core.llm_cache import cached_call_async, llm_cache_key
+from src.app.core.llm_client import PROVIDER_RATE_LIMIT_ERRORS, LLMRateLimitError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Each thread runs its coroutines on one event loop that stays open, so the
+# clients bound to the loop keep their connections between tasks
+_thread_state = threading.local()
+
+# Async LLM clients by event loop
+_loop_llm_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncLLMClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class AsyncLLMClient:
+    """Async LLM client for interacting with Claude/GPT models."""
+
+    def __init__(
+        self,
+        provider: str = settings.LLM_PROVIDER,
+        model: str = settings.LLM_MODEL,
+        api_key: str = None,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        timeout: float = settings.LLM_TIMEOUT_SECONDS,
+    ):
+        """
+        Initialize the async LLM client.
+        
+        The underlying HTTP connection pool belongs to the event loop the
+        client is created on, so use get_async_llm_client, which keeps one
+        client per loop.
+        
+        Args:
+            provider: LLM provider (anthropic, openai)
+            model: LLM model name
+            api_key: API key for the provider
+            max_concurrency: Maximum number of requests in flight at once
+            timeout: Request timeout in seconds
+        """
+        self.provider = provider.lower()
+        self.model = model
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cache = get_loop_redis_client() if settings.LLM_CACHE_ENABLED else None
+        
+        if self.provider == "anthropic":
+            self.api_key = api_key or settings.ANTHROPIC_API_KEY
+            self.client = anthropic.AsyncAnthropic(api_key=self.api_key, timeout=timeout)
+        elif self.provider == "openai":
+            self.api_key = api_key or settings.OPENAI_API_KEY
+            self.client = openai.AsyncOpenAI(api_key=self.api_key, timeout=timeout)
+        else:
+            raise ValueError(f"Unsupported LLM provider: {provider}")
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
+
+    async def generate_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+    ) -> str:
+        """
+        Generate text using the LLM.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt
+            max_tokens: Maximum number of tokens to generate
+            temperature: Temperature for generation
+            
+        Returns:
+            Generated text
+            
+        Raises:
+            LLMRateLimitError: If the provider's rate limit is reached
+            HTTPException: If text generation fails
+        """
+        try:
+            async def call() -> str:
+                return await self._request(prompt, system_prompt, max_tokens, temperature)
+            
+            if self._cache is None:
+                return await call()
+            
+            # Identical requests are answered from the cache
+            key = llm_cache_key(self.model, prompt, system_prompt, max_tokens, temperature)
+            return await cached_call_async(self._cache, key, call)
+        except PROVIDER_RATE_LIMIT_ERRORS as e:
+            logger.warning(f"LLM rate limit reached: {str(e)}")
+            raise LLMRateLimitError(str(e)) from e
+        except Exception as e:
+            logger.error(f"LLM text generation failed: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"LLM text generation failed: {str(e)}",
+            )
+
+
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[str]:
+        """
+        Generate text using the LLM, yielding it in pieces as it arrives.
+        
+        A cached response is yielded whole. A completed stream is cached like
+        a generate_text response.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt
+            max_tokens: Maximum number of tokens to generate
+            temperature: Temperature for generation
+            
+        Yields:
+            Pieces of the generated text
+            
+        Raises:
+            LLMRateLimitError: If the provider's rate limit is reached
+            HTTPException: If text generation fails
+        """
+        key = llm_cache_key(self.model, prompt, system_prompt, max_tokens, temperature)
+        if self._cache is not None:
+            try:
+                cached = await self._cache.get(key)
+                if cached is not None:
+                    yield cached.decode("utf-8")
+                    return
+            except redis.RedisError as e:
+                logger.warning(f"Failed to read cached LLM response for key {key}: {str(e)}")
+        
+        pieces = []
+        try:
+            async with self._semaphore:
+                if self.provider == "anthropic":
+                    async with self.client.messages.stream(
+                        model=self.model,
+                        messages=[{"role": "user", "content": prompt}],
+                        system=system_prompt,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                    ) as stream:
+                        async for text in stream.text_stream:
+                            pieces.append(text)
+                            yield text
+                else:
+                    messages = []
+                    if system_prompt:
+                        messages.append({"role": "system", "content": system_prompt})
+                    messages.append({"role": "user", "content": prompt})
+                    
+                    stream = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        stream=True,
+                    )
+                    async for chunk in stream:
+                        text = chunk.choices[0].delta.content if chunk.choices else None
+                        if text:
+                            pieces.append(text)
+                            yield text
+        except PROVIDER_RATE_LIMIT_ERRORS as e:
+            logger.warning(f"LLM rate limit reached: {str(e)}")
+            raise LLMRateLimitError(str(e)) from e
+        except Exception as e:
+            logger.error(f"LLM text generation failed: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"LLM text generation failed: {str(e)}",
+            )
+        
+        if self._cache is not None:
+            try:
+                await self._cache.setex(key, settings.LLM_CACHE_TTL, "".join(pieces))
+            except redis.RedisError as e:
+                logger.warning(f"Failed to cache LLM response for key {key}: {str(e)}")
+
+    async def _request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+    ) -> str:
+        """
+        Send a single request to the provider, within the concurrency limit.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt
+            max_tokens: Maximum number of tokens to generate
+            temperature: Temperature for generation
+            
+        Returns:
+            Generated text
+        """
+        async with self._semaphore:
+            if self.provider == "anthropic":
+                response = await self.client.messages.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    system=system_prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+                return response.content[0].text
+            
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+            
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+            return response.choices[0].message.content
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion on the calling thread's event loop.
+    
+    Unlike asyncio.run(), the loop is kept open between calls, so the
+    clients bound to it are reused by the thread's next task.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _thread_state.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
+
+def get_async_llm_client() -> AsyncLLMClient:
+    """
+    Get the async LLM client of the running event loop, creating it on
+    first use.
+    
+    Returns:
+        Async LLM client instance
+    """
+    loop = asyncio.get_running_loop()
+    client = _loop_llm_clients.get(loop)
+    if client is None:
+        client = _loop_llm_clients[loop] = AsyncLLMClient(
+            provider=settings.LLM_PROVIDER,
+            model=settings.LLM_MODEL,
+        )
+    return client
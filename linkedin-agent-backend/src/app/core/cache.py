@@ -3,12 +3,19 @@ Caching utilities for the LinkedIn AI Agent.
 This module provides functions for caching data using Redis.
 """
 
+import asyncio
+import inspect
 import json
 import logging
+import threading
+import uuid
+import weakref
 from functools import wraps
 from typing import Any, Callable, Dict, Optional, TypeVar, cast
 
+import orjson
 import redis
+import redis.asyncio as async_redis
 from fastapi import Depends, Request
 
 from src.app.core.config import settings
@@ -21,6 +28,24 @@ redis_client = redis.Redis.from_url(settings.REDIS_URL)
 # Type variable for return type
 T = TypeVar("T")
 
+# Lifetime of a single_flight lock, which the running call keeps extending,
+# and of its stored result
+SINGLE_FLIGHT_TTL_MS = 60_000
+
+# Extend or release a lock only while it still holds the given token
+_extend_lock = redis_client.register_script("""
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+""")
+_release_lock = redis_client.register_script("""
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+""")
+
 
 def get_cache_key(prefix: str, *args: Any, **kwargs: Any) -> str:
     """
@@ -100,6 +125,127 @@ def cache_result(
     return decorator
 
 
+def single_flight(
+    key_fn: Callable[[Dict[str, Any]], str], ttl_ms: int = SINGLE_FLIGHT_TTL_MS
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator to share one call's result with identical concurrent calls.
+    
+    The first caller for a key takes a Redis lock holding a unique token and
+    runs the function, extending the lock until it finishes. Callers that
+    arrive while it runs wait for its result on a channel named after that
+    token, so a later call never receives an earlier call's result. A waiter
+    runs the function itself if the first caller fails or its lock expires
+    without a result. Results must be serializable with orjson.
+    
+    Args:
+        key_fn: Function mapping the call's arguments, by parameter name, to a key
+        ttl_ms: Lock lifetime between extensions, and result lifetime, in milliseconds
+        
+    Returns:
+        Decorated function
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        signature = inspect.signature(func)
+        
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            lock_key = f"llm:inflight:{key_fn(bound.arguments)}"
+            token = uuid.uuid4().hex
+            
+            try:
+                leader_token = None
+                while leader_token is None:
+                    if redis_client.set(lock_key, token, nx=True, px=ttl_ms):
+                        break
+                    # The lock may be released between the two calls, in
+                    # which case try to take it again
+                    leader_token = redis_client.get(lock_key)
+            except redis.RedisError as e:
+                logger.warning(f"Failed to take single-flight lock {lock_key}: {str(e)}")
+                return func(*args, **kwargs)
+            
+            if leader_token is not None:
+                result = _wait_for_flight(lock_key, leader_token.decode(), ttl_ms)
+                if result is not None:
+                    return cast(T, result)
+                return func(*args, **kwargs)
+            
+            result_key = f"{lock_key}:{token}"
+            stop_extending = threading.Event()
+            
+            def extend() -> None:
+                while not stop_extending.wait(ttl_ms / 3000):
+                    try:
+                        if not _extend_lock(keys=[lock_key], args=[token, ttl_ms]):
+                            return
+                    except redis.RedisError as e:
+                        logger.warning(f"Failed to extend single-flight lock {lock_key}: {str(e)}")
+            
+            threading.Thread(target=extend, daemon=True).start()
+            
+            # An empty payload tells waiters that no result is coming
+            payload = b""
+            try:
+                result = func(*args, **kwargs)
+                payload = orjson.dumps(result, default=str)
+                return result
+            finally:
+                stop_extending.set()
+                try:
+                    if payload:
+                        redis_client.set(result_key, payload, px=ttl_ms)
+                    redis_client.publish(result_key, payload)
+                    _release_lock(keys=[lock_key], args=[token])
+                except redis.RedisError as e:
+                    logger.warning(f"Failed to release single-flight lock {lock_key}: {str(e)}")
+        
+        return wrapper
+    
+    return decorator
+
+
+def _wait_for_flight(lock_key: str, leader_token: str, ttl_ms: int) -> Optional[Any]:
+    """
+    Wait for the result of the single_flight call holding a lock.
+    
+    Args:
+        lock_key: Key of the lock held by the running call
+        leader_token: Token the running call stored in the lock
+        ttl_ms: Lifetime of the lock between extensions in milliseconds
+        
+    Returns:
+        The call's result, or None if it failed or its lock expired without one
+    """
+    result_key = f"{lock_key}:{leader_token}"
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(result_key)
+        while True:
+            # Check the stored result too, in case it was published before
+            # the subscription started
+            payload = redis_client.get(result_key)
+            if payload is None:
+                message = pubsub.get_message(timeout=min(1.0, ttl_ms / 1000))
+                if message is not None:
+                    payload = message["data"]
+                elif redis_client.get(lock_key) != leader_token.encode():
+                    # The call finished or its lock expired; take any result
+                    # it stored on the way out
+                    payload = redis_client.get(result_key)
+                    if payload is None:
+                        return None
+            if payload is not None:
+                return orjson.loads(payload) if payload else None
+    except redis.RedisError as e:
+        logger.warning(f"Failed to wait for single-flight result {result_key}: {str(e)}")
+        return None
+    finally:
+        pubsub.close()
+
+
 def invalidate_cache(prefix: str, *args: Any, **kwargs: Any) -> None:
     """
     Invalidate cache for a specific key.
@@ -132,4 +278,42 @@ def get_redis_client() -> redis.Redis:
     Returns:
         Redis client
     """
-    return redis_client 
\ No newline at end of file
+    return redis_client
+
+
+def get_async_redis_client() -> async_redis.Redis:
+    """
+    Get a new async Redis client.
+    
+    The client's connections belong to the event loop they are opened on,
+    so create one per loop and close it before the loop ends.
+    
+    Returns:
+        Async Redis client
+    """
+    return async_redis.Redis.from_url(settings.REDIS_URL)
+
+
+# Async Redis clients by event loop, as a client's connections belong to the
+# loop they are opened on
+_loop_redis_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, async_redis.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_loop_redis_client() -> async_redis.Redis:
+    """
+    Get the async Redis client of the running event loop, creating it on
+    first use.
+    
+    The client is kept for the life of the loop, so a long-lived loop
+    reuses its connections across tasks.
+    
+    Returns:
+        Async Redis client
+    """
+    loop = asyncio.get_running_loop()
+    client = _loop_redis_clients.get(loop)
+    if client is None:
+        client = _loop_redis_clients[loop] = get_async_redis_client()
+    return client
@@ -56,6 +56,10 @@ class Settings(BaseSettings):
             path=f"{values.data.get('POSTGRES_DB') or ''}",
         )
 
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # 30 minutes in seconds
+
     # LinkedIn OAuth settings
     LINKEDIN_CLIENT_ID: str = ""
     LINKEDIN_CLIENT_SECRET: str = ""
@@ -66,6 +70,12 @@ class Settings(BaseSettings):
     LLM_MODEL: str = "claude-3-opus-20240229"  # claude-3-opus-20240229, gpt-4-turbo, etc.
     ANTHROPIC_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
+    LLM_MAX_CONCURRENCY: int = 8  # Requests in flight at once per async client
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_TASK_RATE_LIMIT: str = "500/m"  # Per worker; match to the provider's requests-per-minute tier
+    LLM_BULK_MAX_PROFILES: int = 50  # Most user IDs one analyze_profiles_bulk task accepts
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 604800  # 7 days in seconds
     
     # Vector database settings
     VECTOR_DB_PROVIDER: str = "pinecone"  # pinecone, qdrant, etc.
@@ -94,6 +104,10 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/1"
     CACHE_TTL: int = 3600  # 1 hour in seconds
 
+    # Monitoring settings
+    PROMETHEUS_MULTIPROC_ROOT: str = "/tmp/prom_mp"  # Each service writes to its own subdirectory
+    METRICS_ENABLED: bool = True
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -3,14 +3,17 @@ LinkedIn API client for the LinkedIn AI Agent.
 This module provides functions for interacting with the LinkedIn API.
 """
 
-import json
 import logging
 import time
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlencode
 
+import orjson
 import requests
 from fastapi import HTTPException, status
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.app.core.config import settings
 
@@ -24,6 +27,37 @@ LINKEDIN_EMAIL_URL = "https://api.linkedin.com/v2/emailAddress?q=members&project
 LINKEDIN_PROFILE_PICTURE_URL = "https://api.linkedin.com/v2/me?projection=(id,profilePicture(displayImage~:playableStreams))"
 LINKEDIN_JOBS_URL = "https://api.linkedin.com/v2/jobSearch"
 
+# Keep-alive connection pool shared by all LinkedIn API calls in a process
+LINKEDIN_POOL_CONNECTIONS = 20
+LINKEDIN_POOL_MAXSIZE = 100
+
+
+def _build_session() -> requests.Session:
+    """
+    Build an HTTP session with a keep-alive connection pool for the LinkedIn API.
+    
+    Idempotent GET requests are retried on connection errors and on
+    throttling or server errors; token requests are never retried.
+    
+    Returns:
+        Configured session
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=LINKEDIN_POOL_CONNECTIONS,
+        pool_maxsize=LINKEDIN_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
 
 class LinkedInClient:
     """LinkedIn API client."""
@@ -33,6 +67,7 @@ class LinkedInClient:
         client_id: str = settings.LINKEDIN_CLIENT_ID,
         client_secret: str = settings.LINKEDIN_CLIENT_SECRET,
         redirect_uri: str = settings.LINKEDIN_REDIRECT_URI,
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize the LinkedIn client.
@@ -41,10 +76,13 @@ class LinkedInClient:
             client_id: LinkedIn client ID
             client_secret: LinkedIn client secret
             redirect_uri: LinkedIn redirect URI
+            session: HTTP session to send requests with; a pooled session is
+                created if not given
         """
         self.client_id = client_id
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
+        self.session = session or _build_session()
 
     def get_authorization_url(self, state: str = None) -> str:
         """
@@ -90,15 +128,15 @@ class LinkedInClient:
         }
         
         try:
-            response = requests.post(LINKEDIN_TOKEN_URL, data=payload)
+            response = self.session.post(LINKEDIN_TOKEN_URL, data=payload)
             response.raise_for_status()
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
             
             # Add expiration timestamp
             token_data["expires_at"] = int(time.time()) + token_data.get("expires_in", 0)
             
             return token_data
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"LinkedIn token exchange failed: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -126,15 +164,15 @@ class LinkedInClient:
         }
         
         try:
-            response = requests.post(LINKEDIN_TOKEN_URL, data=payload)
+            response = self.session.post(LINKEDIN_TOKEN_URL, data=payload)
             response.raise_for_status()
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
             
             # Add expiration timestamp
             token_data["expires_at"] = int(time.time()) + token_data.get("expires_in", 0)
             
             return token_data
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"LinkedIn token refresh failed: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -158,19 +196,19 @@ class LinkedInClient:
         
         try:
             # Get basic profile
-            profile_response = requests.get(LINKEDIN_PROFILE_URL, headers=headers)
+            profile_response = self.session.get(LINKEDIN_PROFILE_URL, headers=headers)
             profile_response.raise_for_status()
-            profile_data = profile_response.json()
+            profile_data = orjson.loads(profile_response.content)
             
             # Get email
-            email_response = requests.get(LINKEDIN_EMAIL_URL, headers=headers)
+            email_response = self.session.get(LINKEDIN_EMAIL_URL, headers=headers)
             email_response.raise_for_status()
-            email_data = email_response.json()
+            email_data = orjson.loads(email_response.content)
             
             # Get profile picture
-            picture_response = requests.get(LINKEDIN_PROFILE_PICTURE_URL, headers=headers)
+            picture_response = self.session.get(LINKEDIN_PROFILE_PICTURE_URL, headers=headers)
             picture_response.raise_for_status()
-            picture_data = picture_response.json()
+            picture_data = orjson.loads(picture_response.content)
             
             # Extract email
             email = None
@@ -204,7 +242,7 @@ class LinkedInClient:
             }
             
             return combined_data
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"LinkedIn profile retrieval failed: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -254,9 +292,9 @@ class LinkedInClient:
         # These would need to be mapped to LinkedIn's specific values
         
         try:
-            response = requests.get(LINKEDIN_JOBS_URL, headers=headers, params=params)
+            response = self.session.get(LINKEDIN_JOBS_URL, headers=headers, params=params)
             response.raise_for_status()
-            jobs_data = response.json()
+            jobs_data = orjson.loads(response.content)
             
             # Process and return jobs
             jobs = []
@@ -275,7 +313,7 @@ class LinkedInClient:
                     jobs.append(processed_job)
             
             return jobs
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"LinkedIn job search failed: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -283,9 +321,13 @@ class LinkedInClient:
             )
 
 
+@lru_cache(maxsize=1)
 def get_linkedin_client() -> LinkedInClient:
     """
-    Get a LinkedIn client instance.
+    Get the shared LinkedIn client instance.
+    
+    The client is created once per process so its connection pool is reused
+    across calls.
     
     Returns:
         LinkedIn client instance
@@ -0,0 +1,111 @@
+"""
+LLM response caching for the LinkedIn AI Agent.
+This module provides functions for caching LLM responses in Redis, keyed on
+the exact request sent to the model.
+"""
+
+import hashlib
+import logging
+from typing import Awaitable, Callable, Optional
+
+import orjson
+import redis
+import redis.asyncio as async_redis
+
+from src.app.core.cache import redis_client
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def llm_cache_key(
+    model: str,
+    prompt: str,
+    system_prompt: Optional[str],
+    max_tokens: int,
+    temperature: float,
+) -> str:
+    """
+    Generate the cache key for an LLM request.
+    
+    Args:
+        model: LLM model name
+        prompt: User prompt
+        system_prompt: System prompt
+        max_tokens: Maximum number of tokens to generate
+        temperature: Temperature for generation
+        
+    Returns:
+        Cache key string
+    """
+    canonical = orjson.dumps([model, system_prompt, prompt, max_tokens, temperature])
+    return f"llm:{model}:{hashlib.blake2b(canonical).hexdigest()}"
+
+
+def cached_call(key: str, fn: Callable[[], str], ttl: int = settings.LLM_CACHE_TTL) -> str:
+    """
+    Return the cached response for a key, calling the LLM on a miss.
+    
+    Cache errors are logged and fall through to the LLM call.
+    
+    Args:
+        key: Cache key from llm_cache_key
+        fn: Function making the LLM call
+        ttl: Time to live in seconds
+        
+    Returns:
+        LLM response text
+    """
+    try:
+        cached = redis_client.get(key)
+        if cached is not None:
+            return cached.decode("utf-8")
+    except redis.RedisError as e:
+        logger.warning(f"Failed to read cached LLM response for key {key}: {str(e)}")
+    
+    response = fn()
+    
+    try:
+        redis_client.setex(key, ttl, response)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to cache LLM response for key {key}: {str(e)}")
+    
+    return response
+
+
+async def cached_call_async(
+    cache: async_redis.Redis,
+    key: str,
+    fn: Callable[[], Awaitable[str]],
+    ttl: int = settings.LLM_CACHE_TTL,
+) -> str:
+    """
+    Return the cached response for a key, awaiting the LLM call on a miss.
+    
+    Cache errors are logged and fall through to the LLM call.
+    
+    Args:
+        cache: Async Redis client
+        key: Cache key from llm_cache_key
+        fn: Coroutine function making the LLM call
+        ttl: Time to live in seconds
+        
+    Returns:
+        LLM response text
+    """
+    try:
+        cached = await cache.get(key)
+        if cached is not None:
+            return cached.decode("utf-8")
+    except redis.RedisError as e:
+        logger.warning(f"Failed to read cached LLM response for key {key}: {str(e)}")
+    
+    response = await fn()
+    
+    try:
+        await cache.setex(key, ttl, response)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to cache LLM response for key {key}: {str(e)}")
+    
+    return response
+
@@ -6,16 +6,46 @@ This module provides functions for interacting with LLM models (Claude/GPT).
 import json
 import logging
 import os
+import threading
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 
 import anthropic
+import httpx
 import openai
 from fastapi import HTTPException, status
 
 from src.app.core.config import settings
+from src.app.core.llm_cache import cached_call, llm_cache_key
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connection pool shared by all LLM calls in a process
+LLM_POOL_MAX_CONNECTIONS = 100
+LLM_POOL_MAX_KEEPALIVE = 50
+
+# Provider errors for requests rejected by the provider's rate limit
+PROVIDER_RATE_LIMIT_ERRORS = (anthropic.RateLimitError, openai.RateLimitError)
+
+
+class LLMRateLimitError(Exception):
+    """Raised when the LLM provider rejects a request for exceeding its rate limit."""
+
+
+def _build_http_client() -> httpx.Client:
+    """
+    Build an HTTP client with a keep-alive connection pool for the LLM provider.
+    
+    Returns:
+        Configured HTTP client
+    """
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=LLM_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+        ),
+    )
+
 
 class LLMClient:
     """LLM client for interacting with Claude/GPT models."""
@@ -25,6 +55,7 @@ class LLMClient:
         provider: str = settings.LLM_PROVIDER,
         model: str = settings.LLM_MODEL,
         api_key: str = None,
+        http_client: Optional[httpx.Client] = None,
     ):
         """
         Initialize the LLM client.
@@ -33,16 +64,19 @@ class LLMClient:
             provider: LLM provider (anthropic, openai)
             model: LLM model name
             api_key: API key for the provider
+            http_client: HTTP client to send requests with; a pooled client is
+                created if not given
         """
         self.provider = provider.lower()
         self.model = model
+        http_client = http_client or _build_http_client()
         
         if self.provider == "anthropic":
             self.api_key = api_key or settings.ANTHROPIC_API_KEY
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = anthropic.Anthropic(api_key=self.api_key, http_client=http_client)
         elif self.provider == "openai":
             self.api_key = api_key or settings.OPENAI_API_KEY
-            self.client = openai.OpenAI(api_key=self.api_key)
+            self.client = openai.OpenAI(api_key=self.api_key, http_client=http_client)
         else:
             raise ValueError(f"Unsupported LLM provider: {provider}")
 
@@ -66,25 +100,34 @@ class LLMClient:
             Generated text
             
         Raises:
+            LLMRateLimitError: If the provider's rate limit is reached
             HTTPException: If text generation fails
         """
         try:
             if self.provider == "anthropic":
-                return self._generate_text_anthropic(
-                    prompt=prompt,
-                    system_prompt=system_prompt,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                )
+                generate = self._generate_text_anthropic
             elif self.provider == "openai":
-                return self._generate_text_openai(
+                generate = self._generate_text_openai
+            else:
+                raise ValueError(f"Unsupported LLM provider: {self.provider}")
+            
+            def call() -> str:
+                return generate(
                     prompt=prompt,
                     system_prompt=system_prompt,
                     max_tokens=max_tokens,
                     temperature=temperature,
                 )
-            else:
-                raise ValueError(f"Unsupported LLM provider: {self.provider}")
+            
+            if not settings.LLM_CACHE_ENABLED:
+                return call()
+            
+            # Identical requests are answered from the cache
+            key = llm_cache_key(self.model, prompt, system_prompt, max_tokens, temperature)
+            return cached_call(key, call)
+        except PROVIDER_RATE_LIMIT_ERRORS as e:
+            logger.warning(f"LLM rate limit reached: {str(e)}")
+            raise LLMRateLimitError(str(e)) from e
         except Exception as e:
             logger.error(f"LLM text generation failed: {str(e)}")
             raise HTTPException(
@@ -92,6 +135,20 @@ class LLMClient:
                 detail=f"LLM text generation failed: {str(e)}",
             )
 
+    def warmup(self) -> None:
+        """
+        Open a connection to the provider ahead of the first request.
+        
+        Sends a cheap request through the client's HTTP connection pool, so
+        the DNS lookup and TLS handshake are done before a prompt is ready.
+        Failures are ignored; the next request then connects itself.
+        """
+        path = "/v1/models" if self.provider == "anthropic" else "/models"
+        try:
+            self.client.with_options(max_retries=0, timeout=5.0).get(path, cast_to=httpx.Response)
+        except Exception as e:
+            logger.debug(f"LLM connection warmup failed: {str(e)}")
+
     def _generate_text_anthropic(
         self,
         prompt: str,
@@ -354,14 +411,21 @@ class LLMClient:
             }
 
 
+@lru_cache(maxsize=1)
 def get_llm_client() -> LLMClient:
     """
-    Get an LLM client instance.
+    Get the shared LLM client instance.
+    
+    The client is created once per process so its connection pool is reused
+    across calls. Its first connection is opened in the background as soon
+    as it is created.
     
     Returns:
         LLM client instance
     """
-    return LLMClient(
+    client = LLMClient(
         provider=settings.LLM_PROVIDER,
         model=settings.LLM_MODEL,
-    ) 
\ No newline at end of file
+    )
+    threading.Thread(target=client.warmup, daemon=True).start()
+    return client
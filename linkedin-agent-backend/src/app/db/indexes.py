@@ -43,7 +43,12 @@ def get_existing_indexes(engine: Engine, table_name: str) -> List[str]:
 
 
 def create_index(
-    engine: Engine, table_name: str, column_names: List[str], index_name: Optional[str] = None, unique: bool = False
+    engine: Engine,
+    table_name: str,
+    column_names: List[str],
+    index_name: Optional[str] = None,
+    unique: bool = False,
+    where: Optional[str] = None,
 ) -> bool:
     """
     Create an index on a table.
@@ -54,6 +59,7 @@ def create_index(
         column_names: Column names to include in the index
         index_name: Index name (auto-generated if None)
         unique: Whether the index should be unique
+        where: Predicate for a partial index (full index if None)
         
     Returns:
         True if index was created, False otherwise
@@ -71,8 +77,9 @@ def create_index(
         # Create index
         columns_str = ", ".join(column_names)
         unique_str = "UNIQUE" if unique else ""
+        where_str = f" WHERE {where}" if where else ""
         with engine.begin() as conn:
-            conn.execute(text(f"CREATE {unique_str} INDEX {index_name} ON {table_name} ({columns_str})"))
+            conn.execute(text(f"CREATE {unique_str} INDEX {index_name} ON {table_name} ({columns_str}){where_str}"))
         
         logger.info(f"Created index {index_name} on table {table_name} ({columns_str})")
         return True
@@ -202,6 +209,24 @@ def create_standard_indexes() -> None:
     create_index(engine, "message", ["sender_id"])
     create_composite_index(engine, "message", ["connection_id", "sent_at"])
     create_index(engine, "message", ["is_read"])
+    
+    # Admin task indexes (cleanup_old_data and generate_activity_report filters)
+    create_index(engine, "jobs", ["created_at"], index_name="ix_jobs_created_at")
+    create_index(engine, "jobs", ["updated_at"], index_name="ix_jobs_updated_at")
+    create_index(engine, "applications", ["created_at"], index_name="ix_applications_created_at")
+    create_index(engine, "applications", ["updated_at"], index_name="ix_applications_updated_at")
+    create_composite_index(
+        engine, "applications", ["status", "application_date"], index_name="ix_applications_status_application_date"
+    )
+    create_index(engine, "resumes", ["created_at"], index_name="ix_resumes_created_at")
+    create_index(engine, "cover_letters", ["created_at"], index_name="ix_cover_letters_created_at")
+    create_index(
+        engine,
+        "users",
+        ["id"],
+        index_name="ix_users_linkedin_connected",
+        where="linkedin_access_token IS NOT NULL",
+    )
 
 
 def optimize_database() -> None:
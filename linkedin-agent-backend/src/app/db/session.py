@@ -6,22 +6,26 @@ from typing import Generator
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 from src.app.core.config import settings
 
 # Create SQLAlchemy engine with optimized connection pooling
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    pool_size=20,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=True,
-    pool_recycle=3600,
+    pool_recycle=settings.DB_POOL_RECYCLE,
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Thread-local session registry for Celery tasks; call WorkerSession.remove()
+# when the task finishes to return its connection to the pool
+WorkerSession = scoped_session(SessionLocal)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -18,7 +18,7 @@ class Profile(Base):
     __tablename__ = "profiles"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), unique=True, index=True, nullable=False)
     linkedin_profile_id = Column(String, unique=True, index=True, nullable=True)
     headline = Column(String, nullable=True)
     summary = Column(Text, nullable=True)
@@ -28,6 +28,9 @@ class Profile(Base):
     public_profile_url = Column(String, nullable=True)
     skills = Column(ARRAY(String), nullable=True)
     raw_data = Column(JSON, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    analysis = Column(JSON, nullable=True)
+    analyzed_at = Column(DateTime, nullable=True)
     last_synced_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
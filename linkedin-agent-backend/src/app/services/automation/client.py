@@ -223,11 +223,14 @@ class AutomationService:
                 limit=limit
             )
             
-            # Get detailed job info
+            # Get detailed job info, loading all matched jobs in one query
+            job_ids = [job_match["id"] for job_match in similar_jobs]
+            jobs_by_id = {
+                job.id: job for job in self.db.query(Job).filter(Job.id.in_(job_ids)).all()
+            }
             matching_jobs = []
             for job_match in similar_jobs:
-                job_id = job_match["id"]
-                job = self.db.query(Job).filter(Job.id == job_id).first()
+                job = jobs_by_id.get(job_match["id"])
                 if job:
                     # Get job match score from LLM
                     profile_data = self._create_profile_data(profile)
@@ -6,7 +6,8 @@ This module provides functions for job management, search, filtering, and recomm
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import Row, and_, or_, desc, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from src.app.models.job import Job
@@ -28,6 +29,25 @@ def get_job(db: Session, job_id: str) -> Optional[Job]:
     return db.query(Job).filter(Job.id == job_id).first()
 
 
+def get_job_fields(db: Session, job_id: str) -> Optional[Row]:
+    """
+    Get the fields of a job used in LLM prompts.
+    
+    Only the id, title, company, location and description columns are
+    selected, and no Job object is built.
+    
+    Args:
+        db: Database session
+        job_id: Job ID
+        
+    Returns:
+        Row with the job's fields if found, None otherwise
+    """
+    return db.query(
+        Job.id, Job.title, Job.company, Job.location, Job.description
+    ).filter(Job.id == job_id).first()
+
+
 def get_jobs(
     db: Session, skip: int = 0, limit: int = 100
 ) -> List[Job]:
@@ -113,6 +133,45 @@ def delete_job(db: Session, job_id: str) -> Job:
     return job
 
 
+def bulk_upsert_jobs(db: Session, jobs_in: List[Dict[str, Any]]) -> List[Row]:
+    """
+    Insert or update many jobs in one statement, keyed on the LinkedIn job ID.
+    
+    Existing jobs have every supplied column overwritten. The caller is
+    responsible for committing.
+    
+    Args:
+        db: Database session
+        jobs_in: Job column values, each including linkedin_job_id
+        
+    Returns:
+        The written rows, with the id, linkedin_job_id, title, company,
+        location and description columns, returned by the same statement
+    """
+    # A statement may touch each conflicting row only once, so keep the
+    # last entry per LinkedIn job ID
+    jobs_by_linkedin_id = {
+        job["linkedin_job_id"]: job for job in jobs_in if job.get("linkedin_job_id")
+    }
+    if not jobs_by_linkedin_id:
+        return []
+    
+    stmt = insert(Job).values(list(jobs_by_linkedin_id.values()))
+    update_columns = {
+        key for job in jobs_by_linkedin_id.values() for key in job
+    } - {"id", "linkedin_job_id", "created_at"}
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Job.linkedin_job_id],
+        set_={
+            **{column: stmt.excluded[column] for column in update_columns},
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(
+        Job.id, Job.linkedin_job_id, Job.title, Job.company, Job.location, Job.description
+    )
+    return db.execute(stmt).all()
+
+
 def search_jobs(
     db: Session,
     query: Optional[str] = None,
@@ -3,6 +3,11 @@ LinkedIn API service module.
 This module provides services for interacting with the LinkedIn API.
 """
 
-from src.app.services.linkedin.client import LinkedInService, get_linkedin_service
+from src.app.services.linkedin.client import (
+    LinkedInService,
+    LinkedInTokenRefreshPending,
+    SyncResult,
+    get_linkedin_service,
+)
 
-__all__ = ["LinkedInService", "get_linkedin_service"] 
\ No newline at end of file
+__all__ = ["LinkedInService", "LinkedInTokenRefreshPending", "SyncResult", "get_linkedin_service"] 
\ No newline at end of file
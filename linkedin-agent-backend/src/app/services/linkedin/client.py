@@ -5,20 +5,58 @@ This module provides comprehensive implementations for LinkedIn API operations.
 
 import logging
 import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from redis.exceptions import LockError, RedisError
 from sqlalchemy.orm import Session
 
+from src.app.core.cache import redis_client
 from src.app.core.linkedin_client import LinkedInClient, get_linkedin_client
-from src.app.models.profile import Profile, Experience, Education, Certification, Skill
+from src.app.models.profile import Profile, Experience, Education, Certification
 from src.app.models.job import Job
 from src.app.models.user import User
 from src.app.models.application import Application
 from src.app.db.session import SessionLocal
+from src.app.services.job import bulk_upsert_jobs
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SyncResult:
+    """Outcome of a LinkedIn profile sync."""
+
+    status: str
+    message: str
+    profile: Optional[Profile] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the sync succeeded and produced a profile."""
+        return self.status == "success" and self.profile is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the result to the dictionary returned by the sync task.
+        
+        Returns:
+            Dictionary with sync results
+        """
+        result = {"status": self.status, "message": self.message}
+        if self.profile is not None:
+            result["profile_id"] = str(self.profile.id)
+        if self.data:
+            result["data"] = self.data
+        return result
+
+
+class LinkedInTokenRefreshPending(Exception):
+    """Raised when another task is still refreshing a user's LinkedIn token."""
+
+
 class LinkedInService:
     """LinkedIn API service for comprehensive LinkedIn API operations."""
 
@@ -32,7 +70,7 @@ class LinkedInService:
         self.db = db
         self.client = get_linkedin_client()
 
-    def sync_profile(self, user: User) -> Dict[str, Any]:
+    def sync_profile(self, user: User) -> SyncResult:
         """
         Synchronize a user's LinkedIn profile.
         
@@ -40,7 +78,7 @@ class LinkedInService:
             user: User object with LinkedIn credentials
             
         Returns:
-            Dictionary with sync results
+            Sync result, carrying the synced profile on success
             
         Raises:
             Exception: If profile sync fails
@@ -49,20 +87,20 @@ class LinkedInService:
         
         try:
             # Check token validity and refresh if needed
-            access_token = self._ensure_valid_token(user)
+            access_token = self.get_valid_access_token(user)
             if not access_token:
-                return {
-                    "status": "error",
-                    "message": "Could not obtain valid LinkedIn access token"
-                }
+                return SyncResult(
+                    status="error",
+                    message="Could not obtain valid LinkedIn access token"
+                )
             
             # Fetch basic profile data
             profile_data = self.client.get_profile(access_token)
             if not profile_data:
-                return {
-                    "status": "error",
-                    "message": "Could not retrieve LinkedIn profile data"
-                }
+                return SyncResult(
+                    status="error",
+                    message="Could not retrieve LinkedIn profile data"
+                )
             
             # Fetch extended profile data
             extended_data = self._fetch_extended_profile_data(access_token)
@@ -71,61 +109,122 @@ class LinkedInService:
             full_profile_data = {**profile_data, **extended_data}
             
             # Process and save profile data to database
-            processed_data = self._process_profile_data(user.id, full_profile_data)
+            profile, processed_data = self._process_profile_data(user.id, full_profile_data)
             
-            return {
-                "status": "success",
-                "profile_id": processed_data.get("profile_id"),
-                "message": "LinkedIn profile successfully synchronized",
-                "data": processed_data
-            }
+            return SyncResult(
+                status="success",
+                message="LinkedIn profile successfully synchronized",
+                profile=profile,
+                data=processed_data
+            )
+        except LinkedInTokenRefreshPending:
+            raise
         except Exception as e:
             logger.error(f"Error syncing LinkedIn profile: {str(e)}")
-            return {
-                "status": "error",
-                "message": f"Error syncing LinkedIn profile: {str(e)}"
-            }
+            return SyncResult(
+                status="error",
+                message=f"Error syncing LinkedIn profile: {str(e)}"
+            )
 
-    def _ensure_valid_token(self, user: User) -> Optional[str]:
+    def get_valid_access_token(self, user: User) -> Optional[str]:
         """
-        Ensure the user has a valid LinkedIn access token.
+        Get a valid LinkedIn access token for the user, refreshing it if expired.
+        
+        Refreshes are serialized per user with a Redis lock and the new token
+        is cached in Redis for its lifetime, so concurrent tasks for the same
+        user refresh (and write the user row) only once.
         
         Args:
             user: User object with LinkedIn credentials
             
         Returns:
             Valid access token or None if unable to obtain
+            
+        Raises:
+            LinkedInTokenRefreshPending: If another task is still refreshing
+                the token; the caller should retry shortly
         """
         if not user.linkedin_access_token:
             return None
         
         # Check if token is expired
         now = time.time()
-        if user.linkedin_token_expires_at and user.linkedin_token_expires_at.timestamp() < now:
-            # Token is expired, try to refresh
-            if not user.linkedin_refresh_token:
-                logger.warning(f"User {user.id} has expired LinkedIn token but no refresh token")
-                return None
+        if not (user.linkedin_token_expires_at and user.linkedin_token_expires_at.timestamp() < now):
+            # Token is valid
+            return user.linkedin_access_token
+        
+        if not user.linkedin_refresh_token:
+            logger.warning(f"User {user.id} has expired LinkedIn token but no refresh token")
+            return None
+        
+        token_key = f"li:tok:{user.id}"
+        try:
+            # Another task may already have refreshed the token
+            cached_token = redis_client.get(token_key)
+            if cached_token:
+                return cached_token.decode()
+            
+            with redis_client.lock(f"li:refresh:{user.id}", timeout=30, blocking_timeout=5):
+                # Check again now that we hold the lock
+                cached_token = redis_client.get(token_key)
+                if cached_token:
+                    return cached_token.decode()
+                
+                return self._refresh_access_token(user, token_key, now)
+        except LockError:
+            cached_token = redis_client.get(token_key)
+            if cached_token:
+                return cached_token.decode()
+            logger.warning(f"Timed out waiting for LinkedIn token refresh for user {user.id}")
+            raise LinkedInTokenRefreshPending(
+                f"LinkedIn token refresh for user {user.id} is still in progress"
+            )
+        except RedisError as e:
+            # Without Redis, refresh directly rather than failing the task
+            logger.warning(f"Refreshing LinkedIn token for user {user.id} without Redis: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error refreshing LinkedIn token for user {user.id}: {str(e)}")
+            return None
+        
+        try:
+            return self._refresh_access_token(user, token_key, now)
+        except Exception as e:
+            logger.error(f"Error refreshing LinkedIn token for user {user.id}: {str(e)}")
+            return None
+
+    def _refresh_access_token(self, user: User, token_key: str, now: float) -> Optional[str]:
+        """
+        Refresh a user's LinkedIn access token, save it and cache it in Redis.
+        
+        Args:
+            user: User object with LinkedIn credentials
+            token_key: Redis key the refreshed token is cached under
+            now: Current time as a Unix timestamp
             
+        Returns:
+            The refreshed access token
+        """
+        token_data = self.client.refresh_access_token(user.linkedin_refresh_token)
+        expires_at = token_data.get("expires_at")
+        
+        # Update user with new token
+        user.linkedin_access_token = token_data.get("access_token")
+        user.linkedin_refresh_token = token_data.get("refresh_token")
+        user.linkedin_token_expires_at = (
+            datetime.fromtimestamp(expires_at, tz=timezone.utc).replace(tzinfo=None) if expires_at else None
+        )
+        
+        # Save user
+        self.db.add(user)
+        self.db.commit()
+        
+        # Cache the token for its lifetime
+        if expires_at and expires_at > now:
             try:
-                # Refresh token
-                token_data = self.client.refresh_access_token(user.linkedin_refresh_token)
-                
-                # Update user with new token
-                user.linkedin_access_token = token_data.get("access_token")
-                user.linkedin_refresh_token = token_data.get("refresh_token")
-                user.linkedin_token_expires_at = token_data.get("expires_at")
-                
-                # Save user
-                self.db.add(user)
-                self.db.commit()
-                
-                return user.linkedin_access_token
-            except Exception as e:
-                logger.error(f"Error refreshing LinkedIn token for user {user.id}: {str(e)}")
-                return None
+                redis_client.set(token_key, user.linkedin_access_token, nx=True, ex=int(expires_at - now))
+            except RedisError as e:
+                logger.warning(f"Failed to cache LinkedIn token for user {user.id}: {str(e)}")
         
-        # Token is valid
         return user.linkedin_access_token
 
     def _fetch_extended_profile_data(self, access_token: str) -> Dict[str, Any]:
@@ -185,7 +284,9 @@ class LinkedInService:
             ]
         }
 
-    def _process_profile_data(self, user_id: str, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_profile_data(
+        self, user_id: str, profile_data: Dict[str, Any]
+    ) -> Tuple[Profile, Dict[str, Any]]:
         """
         Process and save LinkedIn profile data to database.
         
@@ -194,7 +295,7 @@ class LinkedInService:
             profile_data: LinkedIn profile data
             
         Returns:
-            Dictionary with processed profile data
+            The saved profile and a dictionary with processed profile data
         """
         # Get or create profile
         profile = self.db.query(Profile).filter(Profile.user_id == user_id).first()
@@ -253,17 +354,11 @@ class LinkedInService:
         
         # Process skills
         if profile_data.get('skills'):
-            # Delete existing skills
-            self.db.query(Skill).filter(Skill.profile_id == profile.id).delete()
-            
-            # Add new skills
-            for skill_data in profile_data.get('skills', []):
-                skill = Skill(
-                    profile_id=profile.id,
-                    name=skill_data.get('name', ''),
-                    endorsements=skill_data.get('endorsements', 0)
-                )
-                self.db.add(skill)
+            profile.skills = [
+                skill_data.get('name', '')
+                for skill_data in profile_data.get('skills', [])
+                if skill_data.get('name')
+            ]
         
         # Process certifications
         if profile_data.get('certifications'):
@@ -285,12 +380,12 @@ class LinkedInService:
         # Commit all changes
         self.db.commit()
         
-        return {
-            "profile_id": profile.id,
+        return profile, {
+            "profile_id": str(profile.id),
             "user_id": user_id,
             "full_name": profile.full_name,
             "headline": profile.headline,
-            "skills": [skill.name for skill in profile.skills] if hasattr(profile, 'skills') else []
+            "skills": list(profile.skills or [])
         }
 
     def search_jobs(
@@ -320,7 +415,7 @@ class LinkedInService:
         
         try:
             # Check token validity and refresh if needed
-            access_token = self._ensure_valid_token(user)
+            access_token = self.get_valid_access_token(user)
             if not access_token:
                 return {
                     "status": "error",
@@ -346,6 +441,8 @@ class LinkedInService:
                 "jobs": processed_jobs,
                 "message": f"Found {len(processed_jobs)} jobs matching your criteria"
             }
+        except LinkedInTokenRefreshPending:
+            raise
         except Exception as e:
             logger.error(f"Error searching LinkedIn jobs: {str(e)}")
             return {
@@ -364,40 +461,38 @@ class LinkedInService:
         Returns:
             List of processed job data
         """
-        processed_jobs = []
+        # Upsert the whole page in one statement; RETURNING hands back the
+        # job IDs without a second lookup
+        job_rows = {
+            job_data['id']: {
+                "title": job_data.get('title', ''),
+                "company": job_data.get('company', ''),
+                "location": job_data.get('location', ''),
+                "description": job_data.get('description', ''),
+                "job_url": job_data.get('apply_url', ''),
+                "posted_at": job_data.get('posted_at'),
+                "linkedin_job_id": job_data['id'],
+                "raw_data": job_data.get('raw', {}),
+            }
+            for job_data in jobs_data
+            if job_data.get('id')
+        }
+        upserted = bulk_upsert_jobs(self.db, list(job_rows.values()))
+        self.db.commit()
         
-        for job_data in jobs_data:
-            # Check if job already exists
-            job = self.db.query(Job).filter(Job.linkedin_job_id == job_data.get('id')).first()
-            
-            if not job:
-                # Create new job
-                job = Job(
-                    title=job_data.get('title', ''),
-                    company=job_data.get('company', ''),
-                    location=job_data.get('location', ''),
-                    description=job_data.get('description', ''),
-                    apply_url=job_data.get('apply_url', ''),
-                    posted_at=job_data.get('posted_at'),
-                    linkedin_job_id=job_data.get('id', ''),
-                    raw_data=job_data.get('raw', {})
-                )
-                self.db.add(job)
-                self.db.commit()
-            
-            # Add to processed jobs
-            processed_jobs.append({
-                "id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "description": job.description,
-                "apply_url": job.apply_url,
-                "posted_at": job.posted_at,
-                "linkedin_job_id": job.linkedin_job_id
-            })
-        
-        return processed_jobs
+        return [
+            {
+                "id": row.id,
+                "title": row.title,
+                "company": row.company,
+                "location": row.location,
+                "description": row.description,
+                "apply_url": job_rows[row.linkedin_job_id]["job_url"],
+                "posted_at": job_rows[row.linkedin_job_id]["posted_at"],
+                "linkedin_job_id": row.linkedin_job_id
+            }
+            for row in upserted
+        ]
 
     def get_connections(self, user: User, page: int = 1, limit: int = 20) -> Dict[str, Any]:
         """
@@ -409,23 +504,55 @@ class LinkedInService:
             limit: Maximum number of results per page
             
         Returns:
-            Dictionary with connections
+            Dictionary with connections, the total connection count and the
+            start offset of the next page (None on the last page)
         """
         logger.info(f"Getting LinkedIn connections for user {user.id}")
         
         try:
             # Check token validity and refresh if needed
-            access_token = self._ensure_valid_token(user)
+            access_token = self.get_valid_access_token(user)
             if not access_token:
                 return {
                     "status": "error",
                     "message": "Could not obtain valid LinkedIn access token"
                 }
+        except LinkedInTokenRefreshPending:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting LinkedIn connections: {str(e)}")
+            return {
+                "status": "error",
+                "message": f"Error getting LinkedIn connections: {str(e)}"
+            }
+        
+        return self.fetch_connections_page(access_token, user.id, page=page, limit=limit)
+
+    def fetch_connections_page(
+        self, access_token: str, user_id: str, page: int = 1, limit: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Fetch one page of a user's LinkedIn connections with a known token.
+        
+        Uses neither the database session nor ORM objects, so pages can be
+        fetched from several threads at once.
+        
+        Args:
+            access_token: Valid LinkedIn access token
+            user_id: User ID
+            page: Page number for pagination
+            limit: Maximum number of results per page
             
+        Returns:
+            Dictionary with connections, the total connection count and the
+            start offset of the next page (None on the last page)
+        """
+        try:
             # TODO: Implement LinkedIn API call to fetch connections
             # This would be an actual API call to LinkedIn
             
             # Mock implementation for now
+            total = 100  # This would be the actual total from API
             connections = [
                 {
                     "id": f"connection_{i}",
@@ -434,17 +561,19 @@ class LinkedInService:
                     "headline": f"Professional {i}",
                     "profilePicture": f"https://example.com/profile{i}.jpg"
                 }
-                for i in range((page - 1) * limit, page * limit)
+                for i in range((page - 1) * limit, min(page * limit, total))
             ]
+            next_start = page * limit if page * limit < total else None
             
             # Process connections
-            processed_connections = self._process_connections(user.id, connections)
+            processed_connections = self._process_connections(user_id, connections)
             
             return {
                 "status": "success",
                 "page": page,
                 "limit": limit,
-                "total": 100,  # This would be the actual total from API
+                "total": total,
+                "next_start": next_start,
                 "connections": processed_connections,
                 "message": f"Retrieved {len(processed_connections)} connections"
             }
@@ -502,7 +631,7 @@ class LinkedInService:
         
         try:
             # Check token validity and refresh if needed
-            access_token = self._ensure_valid_token(user)
+            access_token = self.get_valid_access_token(user)
             if not access_token:
                 return {
                     "status": "error",
@@ -527,6 +656,8 @@ class LinkedInService:
                     "recipient_id": recipient_id,
                     "message": "Failed to send message"
                 }
+        except LinkedInTokenRefreshPending:
+            raise
         except Exception as e:
             logger.error(f"Error sending LinkedIn message: {str(e)}")
             return {
@@ -557,7 +688,7 @@ class LinkedInService:
         
         try:
             # Check token validity and refresh if needed
-            access_token = self._ensure_valid_token(user)
+            access_token = self.get_valid_access_token(user)
             if not access_token:
                 return {
                     "status": "error",
@@ -605,6 +736,8 @@ class LinkedInService:
                     "job_id": job_id,
                     "message": "Failed to apply to job"
                 }
+        except LinkedInTokenRefreshPending:
+            raise
         except Exception as e:
             logger.error(f"Error applying to LinkedIn job: {str(e)}")
             return {
@@ -3,14 +3,17 @@ LLM client service implementation.
 This module provides comprehensive implementations for LLM operations.
 """
 
+import asyncio
 import json
 import logging
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union
+from string import Template
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 from sqlalchemy.orm import Session
 
-from src.app.core.llm_client import LLMClient, get_llm_client
+from src.app.core.async_llm_client import AsyncLLMClient
+from src.app.core.llm_client import LLMClient, LLMRateLimitError, get_llm_client
 from src.app.models.profile import Profile
 from src.app.models.job import Job
 from src.app.models.user import User
@@ -18,6 +21,89 @@ from src.app.db.session import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Independent parts of a profile analysis, requested concurrently by
+# analyze_profile_async: (instructions, JSON structure, fallback on a parse error)
+PROFILE_ANALYSIS_SECTIONS: List[Tuple[str, str, Dict[str, Any]]] = [
+    (
+        """
+            1. Key strengths (skills, experiences, and qualities that stand out)
+            2. Areas for improvement (gaps, weak points, or things to enhance)
+            3. Specific recommendations to enhance the profile (concrete actions)
+        """,
+        """{
+                "strengths": ["strength1", "strength2", ...],
+                "improvement_areas": ["area1", "area2", ...],
+                "recommendations": ["recommendation1", "recommendation2", ...]
+            }""",
+        {
+            "strengths": ["Could not parse strengths"],
+            "improvement_areas": ["Could not parse improvement areas"],
+            "recommendations": ["Could not parse recommendations"],
+        },
+    ),
+    (
+        """
+            1. Skills assessment (present skills, missing important skills, recommendations)
+        """,
+        """{
+                "skills_assessment": {
+                    "present": ["skill1", "skill2", ...],
+                    "missing": ["skill1", "skill2", ...],
+                    "recommendations": ["recommendation1", "recommendation2", ...]
+                }
+            }""",
+        {
+            "skills_assessment": {
+                "present": ["Could not parse present skills"],
+                "missing": ["Could not parse missing skills"],
+                "recommendations": ["Could not parse skill recommendations"]
+            },
+        },
+    ),
+    (
+        """
+            1. Career trajectory analysis (past path, current position, future opportunities)
+        """,
+        """{
+                "career_trajectory": {
+                    "past": "Analysis of past roles and progression",
+                    "current": "Analysis of current position",
+                    "future": "Potential future opportunities and paths"
+                }
+            }""",
+        {
+            "career_trajectory": {
+                "past": "Could not parse past trajectory",
+                "current": "Could not parse current position",
+                "future": "Could not parse future opportunities"
+            },
+        },
+    ),
+]
+
+
+# Message generation prompt, compiled once. JSON inputs are dumped with
+# sorted keys so identical inputs give byte-identical prompts (and hit the
+# LLM response cache).
+MESSAGE_PROMPT_TEMPLATE = Template("""
+            Generate a personalized $message_type message based on the following:
+            
+            Sender profile:
+            $sender
+            
+            Recipient profile:
+            $recipient
+            
+            Context:
+            $context
+            
+            Format your response as JSON with the following structure:
+            {
+                "subject": "Subject line (if applicable)",
+                "message": "The complete message text",
+                "follow_up": "Suggested follow-up message if no response"
+            }
+            """)
 
 class LLMService:
     """LLM service for comprehensive AI operations."""
@@ -116,6 +202,8 @@ class LLMService:
                     },
                     "raw_response": response
                 }
+        except LLMRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Error analyzing LinkedIn profile: {str(e)}")
             return {
@@ -123,6 +211,86 @@ class LLMService:
                 "message": f"Error analyzing LinkedIn profile: {str(e)}"
             }
 
+    async def analyze_profile_async(
+        self, profile_data: Dict[str, Any], client: AsyncLLMClient
+    ) -> Dict[str, Any]:
+        """
+        Analyze a LinkedIn profile using LLM, requesting each part of the
+        analysis concurrently.
+        
+        Args:
+            profile_data: LinkedIn profile data
+            client: Async LLM client to send the requests with
+            
+        Returns:
+            Dictionary with analysis results, in the same format as analyze_profile
+        """
+        logger.info("Analyzing LinkedIn profile")
+        
+        profile_json = json.dumps(profile_data, indent=2, default=str)
+        try:
+            responses = await asyncio.gather(*(
+                client.generate_text(
+                    prompt=f"""
+            Analyze the following LinkedIn profile and provide:
+            {instructions}
+            Profile data:
+            {profile_json}
+            
+            Format your response as JSON with the following structure:
+            {structure}
+            """,
+                    system_prompt=self.system_prompts["profile_analysis"],
+                    max_tokens=1000,
+                    temperature=0.3,
+                )
+                for instructions, structure, _ in PROFILE_ANALYSIS_SECTIONS
+            ))
+        except LLMRateLimitError:
+            raise
+        except Exception as e:
+            logger.error(f"Error analyzing LinkedIn profile: {str(e)}")
+            return {
+                "status": "error",
+                "message": f"Error analyzing LinkedIn profile: {str(e)}"
+            }
+        
+        analysis = {}
+        unparsed = []
+        for (_, _, fallback), response in zip(PROFILE_ANALYSIS_SECTIONS, responses):
+            try:
+                analysis.update(json.loads(response))
+            except json.JSONDecodeError:
+                logger.error("Failed to parse LLM response as JSON")
+                analysis.update(fallback)
+                unparsed.append(response)
+        
+        if unparsed:
+            analysis["raw_response"] = "\n".join(unparsed)
+        return analysis
+
+    async def analyze_profiles_async(
+        self, profiles_data: List[Dict[str, Any]], client: AsyncLLMClient
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Analyze several LinkedIn profiles concurrently.
+        
+        The client's concurrency limit bounds the requests in flight across
+        all of the profiles. A profile whose analysis raises, such as with
+        LLMRateLimitError, doesn't cancel the others; the exception is
+        returned in its place.
+        
+        Args:
+            profiles_data: LinkedIn profile data for each profile
+            client: Async LLM client to send the requests with
+            
+        Returns:
+            Analysis results or exceptions, in the same order as the profiles
+        """
+        return await asyncio.gather(*(
+            self.analyze_profile_async(profile_data, client) for profile_data in profiles_data
+        ), return_exceptions=True)
+
     def match_job(
         self, 
         profile_data: Dict[str, Any],
@@ -191,6 +359,8 @@ class LLMService:
                     "summary": "Could not generate a proper match analysis",
                     "raw_response": response
                 }
+        except LLMRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Error matching profile to job: {str(e)}")
             return {
@@ -274,6 +444,8 @@ class LLMService:
                     "signature": "Sincerely,\n[Candidate Name]",
                     "full_text": response
                 }
+        except LLMRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Error generating cover letter: {str(e)}")
             return {
@@ -380,6 +552,8 @@ class LLMService:
                     "general_recommendations": ["Could not generate proper recommendations"],
                     "raw_response": response
                 }
+        except LLMRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Error tailoring resume: {str(e)}")
             return {
@@ -409,47 +583,64 @@ class LLMService:
         logger.info(f"Generating {message_type} message")
         
         try:
-            # Create prompt for message generation
-            prompt = f"""
-            Generate a personalized {message_type} message based on the following:
-            
-            Sender profile:
-            {json.dumps(sender_data, indent=2)}
-            
-            Recipient profile:
-            {json.dumps(recipient_data, indent=2)}
-            
-            Context:
-            {json.dumps(context, indent=2)}
-            
-            Format your response as JSON with the following structure:
-            {{
-                "subject": "Subject line (if applicable)",
-                "message": "The complete message text",
-                "follow_up": "Suggested follow-up message if no response"
-            }}
-            """
-            
             # Get message from LLM
             response = self.client.generate_text(
-                prompt=prompt,
+                prompt=self._message_prompt(sender_data, recipient_data, context, message_type),
                 system_prompt=self.system_prompts["message_generation"],
                 max_tokens=1000,
                 temperature=0.7,
             )
             
-            try:
-                # Parse JSON response
-                message = json.loads(response)
-                return message
-            except json.JSONDecodeError:
-                # Handle parsing error
-                logger.error("Failed to parse LLM response as JSON")
-                return {
-                    "subject": "",
-                    "message": response,
-                    "follow_up": ""
-                }
+            return self._parse_message(response)
+        except LLMRateLimitError:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating message: {str(e)}")
+            return {
+                "status": "error",
+                "message": f"Error generating message: {str(e)}"
+            }
+
+    async def generate_message_stream(
+        self,
+        sender_data: Dict[str, Any],
+        recipient_data: Dict[str, Any],
+        context: Dict[str, Any],
+        client: AsyncLLMClient,
+        on_text: Callable[[str], Awaitable[None]],
+        message_type: str = "connection_request"
+    ) -> Dict[str, Any]:
+        """
+        Generate a personalized message using LLM, passing the response text
+        to a callback as it streams in.
+        
+        Args:
+            sender_data: Sender profile data
+            recipient_data: Recipient profile data
+            context: Additional context information
+            client: Async LLM client to send the request with
+            on_text: Coroutine function called with each piece of response text
+            message_type: Type of message (connection_request, follow_up, etc.)
+            
+        Returns:
+            Dictionary with generated message, in the same format as generate_message
+        """
+        logger.info(f"Generating {message_type} message")
+        
+        try:
+            pieces = []
+            async for text in client.generate_text_stream(
+                prompt=self._message_prompt(sender_data, recipient_data, context, message_type),
+                system_prompt=self.system_prompts["message_generation"],
+                max_tokens=1000,
+                temperature=0.7,
+            ):
+                pieces.append(text)
+                await on_text(text)
+            
+            return self._parse_message("".join(pieces))
+        except LLMRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Error generating message: {str(e)}")
             return {
@@ -457,6 +648,54 @@ class LLMService:
                 "message": f"Error generating message: {str(e)}"
             }
 
+    def _message_prompt(
+        self,
+        sender_data: Dict[str, Any],
+        recipient_data: Dict[str, Any],
+        context: Dict[str, Any],
+        message_type: str
+    ) -> str:
+        """
+        Build the prompt for message generation.
+        
+        Args:
+            sender_data: Sender profile data
+            recipient_data: Recipient profile data
+            context: Additional context information
+            message_type: Type of message
+            
+        Returns:
+            Prompt text
+        """
+        return MESSAGE_PROMPT_TEMPLATE.substitute(
+            message_type=message_type,
+            sender=json.dumps(sender_data, indent=2, sort_keys=True, default=str),
+            recipient=json.dumps(recipient_data, indent=2, sort_keys=True, default=str),
+            context=json.dumps(context, indent=2, sort_keys=True, default=str),
+        )
+
+    def _parse_message(self, response: str) -> Dict[str, Any]:
+        """
+        Parse a message generation response.
+        
+        Args:
+            response: LLM response text
+            
+        Returns:
+            Dictionary with generated message
+        """
+        try:
+            # Parse JSON response
+            return json.loads(response)
+        except json.JSONDecodeError:
+            # Handle parsing error
+            logger.error("Failed to parse LLM response as JSON")
+            return {
+                "subject": "",
+                "message": response,
+                "follow_up": ""
+            }
+
     def prepare_interview(
         self,
         profile_data: Dict[str, Any],
@@ -550,6 +789,8 @@ class LLMService:
                     "general_advice": "Could not generate general advice",
                     "raw_response": response
                 }
+        except LLMRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Error preparing interview materials: {str(e)}")
             return {
@@ -5,13 +5,24 @@ This module provides functions for profile management and LinkedIn profile synch
 
 from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
 
-from src.app.models.profile import Profile
+from src.app.models.profile import Certification, Education, Experience, Profile
 from src.app.models.user import User
 from src.app.schemas.profile import ProfileCreate, ProfileUpdate
 
 
+# Loader options that fetch a profile's user and related rows up front, one
+# SELECT per relationship, instead of lazily on first access
+PROFILE_RELATION_LOADS = (
+    selectinload(Profile.user),
+    selectinload(Profile.experiences),
+    selectinload(Profile.educations),
+    selectinload(Profile.certifications),
+)
+
+
 def get_profile(db: Session, profile_id: str) -> Optional[Profile]:
     """
     Get a profile by ID.
@@ -40,6 +51,75 @@ def get_profile_by_user_id(db: Session, user_id: str) -> Optional[Profile]:
     return db.query(Profile).filter(Profile.user_id == user_id).first()
 
 
+def get_profiles_by_user_ids(db: Session, user_ids: List[str]) -> Dict[str, Profile]:
+    """
+    Get the profiles of several users with a single query, with their
+    experiences, educations and certifications eagerly loaded.
+    
+    Args:
+        db: Database session
+        user_ids: User IDs
+        
+    Returns:
+        Dictionary mapping user ID strings to the profiles found
+    """
+    if not user_ids:
+        return {}
+    profiles = db.query(Profile).options(*PROFILE_RELATION_LOADS).filter(
+        Profile.user_id.in_(user_ids)
+    ).all()
+    return {str(profile.user_id): profile for profile in profiles}
+
+
+def get_profile_data_versions(db: Session, profile_ids: List[Any]) -> Dict[str, str]:
+    """
+    Get a version string for the data of several profiles with a single query.
+    
+    The version changes whenever the profile row or its user row is updated,
+    or any of its experiences, educations or certifications is added, updated
+    or deleted: it combines the latest updated_at across all of them with the
+    number of related rows of each kind.
+    
+    Args:
+        db: Database session
+        profile_ids: Profile IDs
+        
+    Returns:
+        Dictionary mapping profile ID strings to version strings
+    """
+    if not profile_ids:
+        return {}
+    
+    related_models = (Experience, Education, Certification)
+    rows = db.query(
+        Profile.id,
+        func.greatest(
+            Profile.updated_at,
+            select(User.updated_at).where(User.id == Profile.user_id).scalar_subquery(),
+            *(
+                select(func.max(model.updated_at)).where(
+                    model.profile_id == Profile.id
+                ).scalar_subquery()
+                for model in related_models
+            )
+        ).label("updated_at"),
+        *(
+            select(func.count(model.id)).where(
+                model.profile_id == Profile.id
+            ).scalar_subquery()
+            for model in related_models
+        ),
+    ).filter(Profile.id.in_(profile_ids)).all()
+    
+    versions = {}
+    for profile_id, updated_at, *counts in rows:
+        if updated_at is None:
+            continue
+        stamp = int(updated_at.timestamp() * 1_000_000)
+        versions[str(profile_id)] = ".".join(str(part) for part in (stamp, *counts))
+    return versions
+
+
 def get_profiles(
     db: Session, skip: int = 0, limit: int = 100
 ) -> List[Profile]:
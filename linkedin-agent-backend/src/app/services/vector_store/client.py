@@ -3,17 +3,24 @@ Vector store client for the LinkedIn AI Agent.
 This module provides functions for semantic search and vector-based job matching.
 """
 
+import hashlib
+import json
 import logging
 import os
+import uuid
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
+import redis
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from src.app.db.session import SessionLocal
 from src.app.models.profile import Profile
 from src.app.models.job import Job
+from src.app.core.cache import redis_client
 from src.app.core.config import settings
+from src.app.utils.iterables import chunked
 
 # Import embedding models - we'll support multiple providers
 try:
@@ -36,6 +43,34 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of texts embedded, and vectors upserted, per request
+EMBEDDING_BATCH_SIZE = 100
+
+# Number of rows streamed from the database per batch when reindexing
+REINDEX_BATCH_SIZE = 500
+
+# Redis key holding the namespace job vectors are read from and written to.
+# A rebuild loads a fresh namespace and then points this key at it.
+JOBS_NAMESPACE_KEY = "vs:jobs_namespace"
+DEFAULT_JOBS_NAMESPACE = "jobs"
+
+# After switching namespaces, a rebuild re-indexes the jobs updated since it
+# started, minus this margin for clock skew between the app servers
+REBUILD_CATCH_UP_MARGIN = timedelta(minutes=1)
+
+
+def _profile_name(profile: Profile) -> Optional[str]:
+    """
+    Get the name of a profile's user; profiles don't store a name themselves.
+    
+    Args:
+        profile: Profile whose user to read
+        
+    Returns:
+        The user's full name, or None
+    """
+    return profile.user.full_name if profile.user else None
+
 
 class VectorStoreService:
     """Vector store service for semantic search and job matching."""
@@ -80,13 +115,32 @@ class VectorStoreService:
                 )
             
             self.index = pinecone.Index(settings.PINECONE_INDEX_NAME)
+            self.jobs_namespace = self._active_jobs_namespace()
         elif self.vector_store_provider == "in_memory":
             # Simple in-memory vector store for development
             self.vectors = {}
             self.metadata = {}
+            self.jobs_namespace = DEFAULT_JOBS_NAMESPACE
         else:
             raise ValueError(f"Unsupported vector store provider: {self.vector_store_provider}")
 
+    def _active_jobs_namespace(self) -> str:
+        """
+        Get the namespace job vectors currently live in.
+        
+        Returns:
+            The namespace last switched to by a rebuild, or the default if
+            there was none or Redis is unavailable
+        """
+        try:
+            namespace = redis_client.get(JOBS_NAMESPACE_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Error reading the active jobs namespace: {str(e)}")
+            return DEFAULT_JOBS_NAMESPACE
+        if isinstance(namespace, bytes):
+            namespace = namespace.decode()
+        return namespace or DEFAULT_JOBS_NAMESPACE
+
     def get_embedding(self, text: str) -> List[float]:
         """
         Get embeddings for text using the configured provider.
@@ -108,42 +162,101 @@ class VectorStoreService:
         else:
             raise ValueError(f"Unsupported embedding provider: {self.embedding_provider}")
 
-    def index_job(self, job: Job) -> bool:
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Index a job in the vector store.
+        Get embeddings for several texts in one provider call.
         
         Args:
-            job: Job to index
+            texts: Texts to embed
             
         Returns:
-            True if indexing was successful
+            Embedding vectors, in the same order as the texts
         """
-        try:
-            # Create job text representation
-            job_text = f"""
+        if not texts:
+            return []
+        if self.embedding_provider == "openai":
+            response = self.openai_client.embeddings.create(
+                model=self.embedding_model,
+                input=texts
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        elif self.embedding_provider == "sentence_transformers":
+            return self.embedding_model.encode(texts).tolist()
+        else:
+            raise ValueError(f"Unsupported embedding provider: {self.embedding_provider}")
+
+    def _job_text(self, job: Job) -> str:
+        """
+        Build the text representation of a job used for its embedding.
+        
+        Args:
+            job: Job to describe
+            
+        Returns:
+            Job text
+        """
+        return f"""
             Title: {job.title}
             Company: {job.company}
             Location: {job.location}
             Description: {job.description}
             """
+
+    def _job_metadata(self, job: Job) -> Dict[str, Any]:
+        """
+        Build the vector store metadata for a job.
+        
+        Args:
+            job: Job to describe
             
+        Returns:
+            Job metadata
+        """
+        return {
+            "id": str(job.id),
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "type": "job"
+        }
+
+    def _get_jobs_by_id(self, job_ids: List[str]) -> Dict[str, Job]:
+        """
+        Load several jobs with a single query.
+        
+        Args:
+            job_ids: IDs of the jobs to load
+            
+        Returns:
+            Dictionary mapping job ID strings to jobs
+        """
+        if not job_ids:
+            return {}
+        jobs = self.db.query(Job).filter(Job.id.in_(job_ids)).all()
+        return {str(job.id): job for job in jobs}
+
+    def index_job(self, job: Job) -> bool:
+        """
+        Index a job in the vector store.
+        
+        Args:
+            job: Job to index
+            
+        Returns:
+            True if indexing was successful
+        """
+        try:
             # Get embedding
-            embedding = self.get_embedding(job_text)
+            embedding = self.get_embedding(self._job_text(job))
             
             # Store in vector database
             job_id = str(job.id)
-            metadata = {
-                "id": job_id,
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "type": "job"
-            }
+            metadata = self._job_metadata(job)
             
             if self.vector_store_provider == "pinecone":
                 self.index.upsert(
                     vectors=[(job_id, embedding, metadata)],
-                    namespace="jobs"
+                    namespace=self.jobs_namespace
                 )
             elif self.vector_store_provider == "in_memory":
                 self.vectors[job_id] = embedding
@@ -154,44 +267,127 @@ class VectorStoreService:
             logger.error(f"Error indexing job: {str(e)}")
             return False
 
-    def index_profile(self, profile: Profile) -> bool:
+    def index_jobs(self, jobs: List[Job], namespace: Optional[str] = None) -> int:
         """
-        Index a profile in the vector store.
+        Index several jobs, embedding and upserting them in batches.
         
         Args:
-            profile: Profile to index
+            jobs: Jobs to index
+            namespace: Vector store namespace to write to, defaulting to the
+                active jobs namespace
             
         Returns:
-            True if indexing was successful
+            Number of jobs indexed
         """
-        try:
-            # Create profile text representation
-            skills_text = ", ".join([skill.name for skill in profile.skills]) if hasattr(profile, "skills") and profile.skills else ""
-            experiences_text = ""
-            
-            if hasattr(profile, "experiences") and profile.experiences:
-                for exp in profile.experiences:
-                    experiences_text += f"{exp.title} at {exp.company}, {exp.description}\n"
+        indexed = 0
+        for batch in chunked(jobs, EMBEDDING_BATCH_SIZE):
+            try:
+                embeddings = self.get_embeddings([self._job_text(job) for job in batch])
+                vectors = [
+                    (str(job.id), embedding, self._job_metadata(job))
+                    for job, embedding in zip(batch, embeddings)
+                ]
+                
+                self._upsert_vectors(vectors, namespace=namespace or self.jobs_namespace)
+                indexed += len(vectors)
+            except Exception as e:
+                logger.error(f"Error indexing job batch: {str(e)}")
+        
+        return indexed
+
+    def _upsert_vectors(
+        self, vectors: List[Tuple[str, List[float], Dict[str, Any]]], namespace: str
+    ) -> None:
+        """
+        Write a batch of vectors to the vector store.
+        
+        Args:
+            vectors: (id, embedding, metadata) tuples
+            namespace: Vector store namespace
+        """
+        if self.vector_store_provider == "pinecone":
+            self.index.upsert(vectors=vectors, namespace=namespace)
+        elif self.vector_store_provider == "in_memory":
+            for vector_id, embedding, metadata in vectors:
+                self.vectors[vector_id] = embedding
+                self.metadata[vector_id] = metadata
+
+    def _profile_text(self, profile: Profile) -> str:
+        """
+        Build the text representation of a profile used for its embedding.
+        
+        Args:
+            profile: Profile to describe
             
-            profile_text = f"""
-            Name: {profile.full_name}
+        Returns:
+            Profile text
+        """
+        skills_text = ", ".join(profile.skills) if profile.skills else ""
+        experiences_text = ""
+        
+        if hasattr(profile, "experiences") and profile.experiences:
+            for exp in profile.experiences:
+                experiences_text += f"{exp.title} at {exp.company}, {exp.description}\n"
+        
+        return f"""
+            Name: {_profile_name(profile)}
             Headline: {profile.headline}
             Summary: {profile.summary}
             Skills: {skills_text}
             Experience: {experiences_text}
             """
+
+    def profile_content_hash(self, profile: Profile) -> str:
+        """
+        Hash the content a profile is indexed with.
+        
+        Args:
+            profile: Profile to hash
+            
+        Returns:
+            Hex SHA-256 digest of the profile text and metadata
+        """
+        content = json.dumps(
+            [self._profile_text(profile), self._profile_metadata(profile)],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _profile_metadata(self, profile: Profile) -> Dict[str, Any]:
+        """
+        Build the vector store metadata for a profile.
+        
+        Args:
+            profile: Profile to describe
+            
+        Returns:
+            Profile metadata
+        """
+        return {
+            "id": str(profile.id),
+            "name": _profile_name(profile),
+            "headline": profile.headline,
+            "type": "profile"
+        }
+
+    def index_profile(self, profile: Profile) -> bool:
+        """
+        Index a profile in the vector store.
+        
+        Args:
+            profile: Profile to index
             
+        Returns:
+            True if indexing was successful
+        """
+        try:
             # Get embedding
-            embedding = self.get_embedding(profile_text)
+            embedding = self.get_embedding(self._profile_text(profile))
             
             # Store in vector database
             profile_id = str(profile.id)
-            metadata = {
-                "id": profile_id,
-                "name": profile.full_name,
-                "headline": profile.headline,
-                "type": "profile"
-            }
+            metadata = self._profile_metadata(profile)
             
             if self.vector_store_provider == "pinecone":
                 self.index.upsert(
@@ -207,6 +403,44 @@ class VectorStoreService:
             logger.error(f"Error indexing profile: {str(e)}")
             return False
 
+    def index_profiles(self, profiles: List[Profile]) -> int:
+        """
+        Index several profiles, embedding and upserting them in batches.
+        
+        Args:
+            profiles: Profiles to index
+            
+        Returns:
+            Number of profiles indexed
+        """
+        indexed = 0
+        for batch in chunked(profiles, EMBEDDING_BATCH_SIZE):
+            # Describe each profile separately so one bad row is skipped
+            # instead of failing the batch
+            described = []
+            for profile in batch:
+                try:
+                    described.append(
+                        (profile, self._profile_text(profile), self._profile_metadata(profile))
+                    )
+                except Exception as e:
+                    logger.error(f"Error describing profile {profile.id}: {str(e)}")
+            if not described:
+                continue
+            
+            try:
+                embeddings = self.get_embeddings([text for _, text, _ in described])
+                vectors = [
+                    (str(profile.id), embedding, metadata)
+                    for (profile, _, metadata), embedding in zip(described, embeddings)
+                ]
+                self._upsert_vectors(vectors, namespace="profiles")
+                indexed += len(vectors)
+            except Exception as e:
+                logger.error(f"Error indexing profile batch: {str(e)}")
+        
+        return indexed
+
     def find_similar_jobs(
         self, 
         profile_id: str, 
@@ -230,68 +464,57 @@ class VectorStoreService:
             if not profile:
                 return []
             
-            # Create profile text representation
-            skills_text = ", ".join([skill.name for skill in profile.skills]) if hasattr(profile, "skills") and profile.skills else ""
-            experiences_text = ""
-            
-            if hasattr(profile, "experiences") and profile.experiences:
-                for exp in profile.experiences:
-                    experiences_text += f"{exp.title} at {exp.company}, {exp.description}\n"
-            
-            profile_text = f"""
-            Name: {profile.full_name}
-            Headline: {profile.headline}
-            Summary: {profile.summary}
-            Skills: {skills_text}
-            Experience: {experiences_text}
-            """
-            
             # Get embedding
-            query_embedding = self.get_embedding(profile_text)
+            query_embedding = self.get_embedding(self._profile_text(profile))
             
             # Query vector database
             if self.vector_store_provider == "pinecone":
                 results = self.index.query(
                     vector=query_embedding,
                     top_k=limit,
-                    namespace="jobs",
+                    namespace=self.jobs_namespace,
                     include_metadata=True
                 )
                 
-                # Process results
+                # Process results, loading the matched jobs in one query
+                scored = [match for match in results["matches"] if match["score"] >= min_score]
+                jobs_by_id = self._get_jobs_by_id([match["id"] for match in scored])
                 matches = []
-                for match in results["matches"]:
-                    if match["score"] >= min_score:
-                        job_id = match["id"]
-                        job = self.db.query(Job).filter(Job.id == job_id).first()
-                        if job:
-                            matches.append({
-                                "id": job.id,
-                                "title": job.title,
-                                "company": job.company,
-                                "location": job.location,
-                                "score": match["score"]
-                            })
+                for match in scored:
+                    job = jobs_by_id.get(match["id"])
+                    if job:
+                        matches.append({
+                            "id": job.id,
+                            "title": job.title,
+                            "company": job.company,
+                            "location": job.location,
+                            "score": match["score"]
+                        })
                 
                 return matches
             elif self.vector_store_provider == "in_memory":
                 # Simple cosine similarity implementation
-                results = []
+                scores = {}
                 for job_id, job_vector in self.vectors.items():
                     metadata = self.metadata.get(job_id)
                     if metadata and metadata.get("type") == "job":
                         # Calculate cosine similarity
                         similarity = self._cosine_similarity(query_embedding, job_vector)
                         if similarity >= min_score:
-                            job = self.db.query(Job).filter(Job.id == job_id).first()
-                            if job:
-                                results.append({
-                                    "id": job.id,
-                                    "title": job.title,
-                                    "company": job.company,
-                                    "location": job.location,
-                                    "score": similarity
-                                })
+                            scores[job_id] = similarity
+                
+                jobs_by_id = self._get_jobs_by_id(list(scores))
+                results = []
+                for job_id, similarity in scores.items():
+                    job = jobs_by_id.get(job_id)
+                    if job:
+                        results.append({
+                            "id": job.id,
+                            "title": job.title,
+                            "company": job.company,
+                            "location": job.location,
+                            "score": similarity
+                        })
                 
                 # Sort by score descending and limit
                 results.sort(key=lambda x: x["score"], reverse=True)
@@ -328,44 +551,49 @@ class VectorStoreService:
                 results = self.index.query(
                     vector=query_embedding,
                     top_k=limit,
-                    namespace="jobs",
+                    namespace=self.jobs_namespace,
                     include_metadata=True
                 )
                 
-                # Process results
+                # Process results, loading the matched jobs in one query
+                scored = [match for match in results["matches"] if match["score"] >= min_score]
+                jobs_by_id = self._get_jobs_by_id([match["id"] for match in scored])
                 matches = []
-                for match in results["matches"]:
-                    if match["score"] >= min_score:
-                        job_id = match["id"]
-                        job = self.db.query(Job).filter(Job.id == job_id).first()
-                        if job:
-                            matches.append({
-                                "id": job.id,
-                                "title": job.title,
-                                "company": job.company,
-                                "location": job.location,
-                                "score": match["score"]
-                            })
+                for match in scored:
+                    job = jobs_by_id.get(match["id"])
+                    if job:
+                        matches.append({
+                            "id": job.id,
+                            "title": job.title,
+                            "company": job.company,
+                            "location": job.location,
+                            "score": match["score"]
+                        })
                 
                 return matches
             elif self.vector_store_provider == "in_memory":
                 # Simple cosine similarity implementation
-                results = []
+                scores = {}
                 for job_id, job_vector in self.vectors.items():
                     metadata = self.metadata.get(job_id)
                     if metadata and metadata.get("type") == "job":
                         # Calculate cosine similarity
                         similarity = self._cosine_similarity(query_embedding, job_vector)
                         if similarity >= min_score:
-                            job = self.db.query(Job).filter(Job.id == job_id).first()
-                            if job:
-                                results.append({
-                                    "id": job.id,
-                                    "title": job.title,
-                                    "company": job.company,
-                                    "location": job.location,
-                                    "score": similarity
-                                })
+                            scores[job_id] = similarity
+                
+                jobs_by_id = self._get_jobs_by_id(list(scores))
+                results = []
+                for job_id, similarity in scores.items():
+                    job = jobs_by_id.get(job_id)
+                    if job:
+                        results.append({
+                            "id": job.id,
+                            "title": job.title,
+                            "company": job.company,
+                            "location": job.location,
+                            "score": similarity
+                        })
                 
                 # Sort by score descending and limit
                 results.sort(key=lambda x: x["score"], reverse=True)
@@ -428,7 +656,7 @@ class VectorStoreService:
                         if profile:
                             matches.append({
                                 "id": profile.id,
-                                "name": profile.full_name,
+                                "name": _profile_name(profile),
                                 "headline": profile.headline,
                                 "user_id": profile.user_id,
                                 "score": match["score"]
@@ -448,7 +676,7 @@ class VectorStoreService:
                             if profile:
                                 results.append({
                                     "id": profile.id,
-                                    "name": profile.full_name,
+                                    "name": _profile_name(profile),
                                     "headline": profile.headline,
                                     "user_id": profile.user_id,
                                     "score": similarity
@@ -497,9 +725,10 @@ class VectorStoreService:
             
             # Filter by keywords if provided
             if keywords and len(keywords) > 0:
+                jobs_by_id = self._get_jobs_by_id([str(result["id"]) for result in semantic_results])
                 filtered_results = []
                 for result in semantic_results:
-                    job = self.db.query(Job).filter(Job.id == result["id"]).first()
+                    job = jobs_by_id.get(str(result["id"]))
                     if job:
                         # Check if any keyword is in title or description
                         job_text = f"{job.title} {job.description}".lower()
@@ -542,29 +771,169 @@ class VectorStoreService:
         
         return dot_product / (norm_vec1 * norm_vec2)
     
-    def reindex_all_jobs(self) -> Tuple[int, int]:
+    def reindex_all_jobs(self, namespace: Optional[str] = None) -> Tuple[int, int]:
         """
         Reindex all jobs in the database.
         
+        Args:
+            namespace: Vector store namespace to write to, defaulting to the
+                active jobs namespace
+            
         Returns:
             Tuple of (success_count, total_count)
         """
         try:
-            # Get all jobs
-            jobs = self.db.query(Job).all()
-            
-            total_count = len(jobs)
-            success_count = 0
-            
-            for job in jobs:
-                if self.index_job(job):
-                    success_count += 1
-            
-            return (success_count, total_count)
+            return self._index_all_jobs(namespace)
         except Exception as e:
             logger.error(f"Error reindexing jobs: {str(e)}")
             return (0, 0)
     
+    def _index_all_jobs(
+        self, namespace: Optional[str] = None, updated_since: Optional[datetime] = None
+    ) -> Tuple[int, int]:
+        """
+        Stream every job from the database and index it batch by batch.
+        
+        Args:
+            namespace: Vector store namespace to write to, defaulting to the
+                active jobs namespace
+            updated_since: Only index jobs updated at or after this time
+            
+        Returns:
+            Tuple of (success_count, total_count)
+        """
+        query = self.db.query(Job)
+        if updated_since is not None:
+            query = query.filter(Job.updated_at >= updated_since)
+        jobs = query.yield_per(REINDEX_BATCH_SIZE)
+        
+        total_count = 0
+        success_count = 0
+        
+        for batch in chunked(jobs, REINDEX_BATCH_SIZE):
+            total_count += len(batch)
+            success_count += self.index_jobs(batch, namespace=namespace)
+        
+        return (success_count, total_count)
+    
+    def clear_namespace(self, namespace: str, vector_type: str) -> None:
+        """
+        Delete every vector in a namespace.
+        
+        The in-memory store has no namespaces, so there every vector of the
+        given type is deleted instead.
+        
+        Args:
+            namespace: Vector store namespace
+            vector_type: Type of the vectors in the namespace ("job" or "profile")
+        """
+        if self.vector_store_provider == "pinecone":
+            self.index.delete(delete_all=True, namespace=namespace)
+        elif self.vector_store_provider == "in_memory":
+            stale_ids = [
+                vector_id for vector_id, metadata in self.metadata.items()
+                if metadata.get("type") == vector_type
+            ]
+            for vector_id in stale_ids:
+                self.vectors.pop(vector_id, None)
+                self.metadata.pop(vector_id, None)
+
+    def bulk_reindex_all_jobs(self) -> Tuple[int, int]:
+        """
+        Rebuild the job vectors from scratch.
+        
+        Every job is bulk loaded into a fresh namespace, so the load only
+        inserts new vectors and leaves out the vectors of deleted jobs. Reads
+        keep using the current namespace until every job has been loaded;
+        only then is the active namespace switched and the old one deleted.
+        If any job fails, the new namespace is discarded instead.
+        
+        Jobs indexed while the rebuild runs still go to the old namespace,
+        so before it is deleted the jobs updated since the rebuild started
+        are indexed again into the new one. If that fails, the old
+        namespace is left in place.
+        
+        The in-memory store has no namespaces, so there every job is
+        reindexed in place and, once all succeeded, the vectors of jobs that
+        no longer exist are dropped.
+        
+        Returns:
+            Tuple of (success_count, total_count)
+        """
+        if self.vector_store_provider == "in_memory":
+            try:
+                success_count, total_count = self._index_all_jobs()
+            except Exception as e:
+                logger.error(f"Error reindexing jobs: {str(e)}")
+                return (0, 0)
+            if success_count == total_count:
+                job_ids = {str(job_id) for (job_id,) in self.db.query(Job.id)}
+                stale_ids = [
+                    vector_id for vector_id, metadata in self.metadata.items()
+                    if metadata.get("type") == "job" and vector_id not in job_ids
+                ]
+                for vector_id in stale_ids:
+                    self.vectors.pop(vector_id, None)
+                    self.metadata.pop(vector_id, None)
+            return (success_count, total_count)
+        
+        new_namespace = f"{DEFAULT_JOBS_NAMESPACE}-{uuid.uuid4().hex}"
+        started_at = datetime.utcnow()
+        try:
+            success_count, total_count = self._index_all_jobs(namespace=new_namespace)
+        except Exception as e:
+            logger.error(f"Error reindexing jobs: {str(e)}")
+            success_count, total_count = (0, 0)
+            failed = True
+        else:
+            failed = success_count != total_count
+        
+        if failed:
+            logger.error(
+                f"Indexed only {success_count}/{total_count} jobs into {new_namespace}; "
+                f"keeping {self.jobs_namespace}"
+            )
+            try:
+                self.clear_namespace(new_namespace, "job")
+            except Exception as e:
+                logger.error(f"Error deleting job namespace {new_namespace}: {str(e)}")
+            return (success_count, total_count)
+        
+        try:
+            redis_client.set(JOBS_NAMESPACE_KEY, new_namespace)
+        except redis.RedisError as e:
+            logger.error(f"Error switching to job namespace {new_namespace}: {str(e)}")
+            try:
+                self.clear_namespace(new_namespace, "job")
+            except Exception as e:
+                logger.error(f"Error deleting job namespace {new_namespace}: {str(e)}")
+            return (0, total_count)
+        
+        old_namespace, self.jobs_namespace = self.jobs_namespace, new_namespace
+        
+        # Catch up on the jobs written to the old namespace during the rebuild
+        try:
+            caught_up, updated_count = self._index_all_jobs(
+                namespace=new_namespace,
+                updated_since=started_at - REBUILD_CATCH_UP_MARGIN
+            )
+        except Exception as e:
+            logger.error(f"Error indexing jobs updated during the rebuild: {str(e)}")
+            return (success_count, total_count)
+        if caught_up != updated_count:
+            logger.error(
+                f"Indexed only {caught_up}/{updated_count} jobs updated during the rebuild; "
+                f"keeping {old_namespace}"
+            )
+            return (success_count, total_count)
+        
+        try:
+            self.clear_namespace(old_namespace, "job")
+        except Exception as e:
+            logger.error(f"Error deleting job namespace {old_namespace}: {str(e)}")
+        
+        return (success_count, total_count)
+
     def reindex_all_profiles(self) -> Tuple[int, int]:
         """
         Reindex all profiles in the database.
@@ -573,15 +942,18 @@ class VectorStoreService:
             Tuple of (success_count, total_count)
         """
         try:
-            # Get all profiles
-            profiles = self.db.query(Profile).all()
+            # Stream profiles from the database and index them batch by batch
+            profiles = self.db.query(Profile).options(
+                selectinload(Profile.user),
+                selectinload(Profile.experiences)
+            ).yield_per(REINDEX_BATCH_SIZE)
             
-            total_count = len(profiles)
+            total_count = 0
             success_count = 0
             
-            for profile in profiles:
-                if self.index_profile(profile):
-                    success_count += 1
+            for batch in chunked(profiles, REINDEX_BATCH_SIZE):
+                total_count += len(batch)
+                success_count += self.index_profiles(batch)
             
             return (success_count, total_count)
         except Exception as e:
@@ -0,0 +1,31 @@
+"""
+Iterable utilities for the LinkedIn AI Agent.
+This module provides helpers for processing iterables in batches.
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Split an iterable into lists of at most `size` items.
+    
+    The iterable is consumed lazily, so only one chunk is held in memory
+    at a time.
+    
+    Args:
+        iterable: Items to split
+        size: Maximum number of items per chunk
+        
+    Returns:
+        Iterator over the chunks
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
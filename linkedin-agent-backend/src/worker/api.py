@@ -3,15 +3,18 @@ API module for Celery worker health checks and metrics.
 This provides simple endpoints for monitoring the worker status.
 """
 
+import glob
 import logging
 import json
+import os
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 from flask import Flask, jsonify, request
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import generate_latest, CollectorRegistry, CONTENT_TYPE_LATEST, multiprocess
 import celery.states as states
 
+from src.app.core.config import settings
 from src.worker.main import celery_app
 from src.worker.monitoring import create_task_report, APP_METRICS
 
@@ -19,6 +22,31 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+class _ServicesCollector:
+    """
+    Aggregate the per-process metric files of every service.
+    
+    Each service writes to its own subdirectory of the multiprocess root,
+    so the directories are globbed on every scrape and merged like
+    MultiProcessCollector does for a single one.
+    """
+    def __init__(self, root: str):
+        self._root = root
+        
+    def collect(self):
+        """
+        Merge the metric files of every service.
+        
+        Returns:
+            Merged metric families
+        """
+        files = glob.glob(os.path.join(self._root, "*", "*.db"))
+        return multiprocess.MultiProcessCollector.merge(files, accumulate=True)
+
+# Aggregate the per-process metric files written by the worker children
+METRICS_REGISTRY = CollectorRegistry()
+METRICS_REGISTRY.register(_ServicesCollector(settings.PROMETHEUS_MULTIPROC_ROOT))
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,14 +64,21 @@ def health_check() -> Dict[str, Any]:
     """
     try:
         # Get celery stats
-        stats = celery_app.control.inspect().stats()
-        
+        insp = celery_app.control.inspect()
+        stats = insp.stats()
+
         if not stats:
             return jsonify({
                 "status": "error",
                 "message": "No Celery workers found"
             }), 503
-        
+
+        # Each inspect call is a broadcast that replies for every worker,
+        # so fetch them once rather than per worker
+        active = insp.active() or {}
+        scheduled = insp.scheduled() or {}
+        reserved = insp.reserved() or {}
+
         # Get worker statuses
         worker_status = []
         for worker_name, worker_stats in stats.items():
@@ -51,9 +86,9 @@ def health_check() -> Dict[str, Any]:
                 "name": worker_name,
                 "status": "online",
                 "processed": worker_stats.get('total', {}).get('processed', 0),
-                "active": len(celery_app.control.inspect().active().get(worker_name, [])),
-                "scheduled": len(celery_app.control.inspect().scheduled().get(worker_name, [])),
-                "reserved": len(celery_app.control.inspect().reserved().get(worker_name, []))
+                "active": len(active.get(worker_name, [])),
+                "scheduled": len(scheduled.get(worker_name, [])),
+                "reserved": len(reserved.get(worker_name, []))
             })
         
         return jsonify({
@@ -77,7 +112,7 @@ def metrics() -> str:
     Returns:
         Prometheus metrics in text format
     """
-    return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+    return generate_latest(METRICS_REGISTRY), 200, {'Content-Type': CONTENT_TYPE_LATEST}
 
 # Task status endpoint
 @app.route('/task/<task_id>', methods=['GET'])
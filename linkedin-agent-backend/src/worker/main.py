@@ -3,10 +3,46 @@ Celery worker entry point for the LinkedIn AI Agent backend.
 """
 
 import os
-from celery import Celery
 
+# Settings only depend on pydantic, so loading them first doesn't create any
+# metrics; the root then resolves from the environment or .env exactly as
+# it does for the metrics API
 from src.app.core.config import settings
 
+# prometheus_client picks its value storage when first imported, so the
+# multiprocess directory must be set before any other module is loaded.
+# Each service unit sets its own directory under PROMETHEUS_MULTIPROC_ROOT,
+# and wipes it before starting; this default is for running outside them.
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(settings.PROMETHEUS_MULTIPROC_ROOT, "default")
+)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+import orjson
+from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
+from kombu.serialization import register
+from prometheus_client import multiprocess
+
+from src.app.core.linkedin_client import get_linkedin_client
+from src.app.core.llm_client import get_llm_client
+from src.app.db.session import engine
+
+# Connect the task signal handlers in the main worker process, which is
+# where task_received fires; forked children inherit them
+import src.worker.monitoring  # noqa: F401
+
+# orjson encodes task payloads and results several times faster than the
+# stdlib json serializer, and handles UUIDs and datetimes natively
+register(
+    "orjson",
+    lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="utf-8",
+)
+
 # Create Celery app
 celery_app = Celery(
     "linkedin_agent",
@@ -16,19 +52,110 @@ celery_app = Celery(
 
 # Configure Celery
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer="orjson",
+    # Still accept json so messages queued before the switch are consumed
+    accept_content=["orjson", "json"],
+    result_serializer="orjson",
+    result_accept_content=["orjson", "json"],
     timezone="UTC",
     enable_utc=True,
     worker_prefetch_multiplier=1,
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     task_track_started=True,
+    # Expire stored results quickly; fan-out tasks don't store theirs at all
+    result_expires=300,
+    # Keep scheduled batch work off the default queue used by interactive
+    # tasks; both queues are consumed by the batch worker
+    task_routes={
+        "admin.*": {"queue": "admin_low"},
+        "linkedin.sync_profile": {"queue": "bulk"},
+        "linkedin.search_jobs": {"queue": "bulk"},
+        "linkedin.find_matching_jobs": {"queue": "bulk"},
+        "linkedin.bulk_index_*": {"queue": "bulk"},
+        "linkedin.index_profile": {"queue": "embeddings"},
+        # LLM tasks spend nearly all their time waiting on the provider, so
+        # they go to thread-pool workers that run many of them per process;
+        # threads rather than gevent, since the tasks run asyncio event loops.
+        # They are split by response length, so short messages don't queue
+        # behind long generations.
+        "llm.generate_message": {"queue": "llm.fast"},
+        "llm.generate_resume": {"queue": "llm.slow"},
+        "llm.prepare_interview": {"queue": "llm.slow"},
+        "llm.*": {"queue": "llm.medium"},
+    },
 )
 
+# Define scheduled tasks. The user-wide fan-outs start at staggered minutes
+# so their scans don't hit the database and broker at the same time, and
+# expire so missed runs don't pile up.
+celery_app.conf.beat_schedule = {
+    # LinkedIn profile sync - every day at 2 AM
+    "sync-profiles-daily": {
+        "task": "admin.sync_all_profiles",
+        "schedule": crontab(hour=2, minute=0),
+        "args": (),
+        "options": {"expires": 300},
+    },
+    
+    # LinkedIn job search - every 4 hours
+    "search-jobs-regularly": {
+        "task": "admin.search_jobs_for_all_users",
+        "schedule": crontab(hour="*/4", minute=10),
+        "args": (),
+        "options": {"expires": 300},
+    },
+    
+    # Update vector index - every day at 3 AM
+    "update-vector-index-daily": {
+        "task": "linkedin.bulk_index_jobs",
+        "schedule": crontab(hour=3, minute=0),
+        "args": (),
+    },
+    
+    # Update profile vector index - every day at 3:30 AM
+    "update-profile-vector-index-daily": {
+        "task": "linkedin.bulk_index_profiles",
+        "schedule": crontab(hour=3, minute=30),
+        "args": (),
+    },
+    
+    # Find matching jobs for users - every day at 4:20 AM
+    "find-matching-jobs-daily": {
+        "task": "admin.find_matching_jobs_for_all_users",
+        "schedule": crontab(hour=4, minute=20),
+        "args": (),
+        "options": {"expires": 300},
+    },
+    
+    # Clean up old data - every week on Sunday at 1 AM
+    "cleanup-old-data-weekly": {
+        "task": "admin.cleanup_old_data",
+        "schedule": crontab(hour=1, minute=0, day_of_week="sunday"),
+        "args": (),
+    },
+}
+
 # Import tasks
 celery_app.autodiscover_tasks(["src.worker.tasks"], force=True)
 
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    # The directory may have been cleaned up since the parent started
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+    
+    # Don't share the parent's pooled connections with the forked child;
+    # close=False leaves the parent's sockets untouched
+    engine.dispose(close=False)
+    
+    # Likewise give the child its own LinkedIn and LLM HTTP connection pools
+    get_linkedin_client.cache_clear()
+    get_llm_client.cache_clear()
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(pid=None, **kwargs):
+    # Drop the live gauge files of the exiting child
+    multiprocess.mark_process_dead(pid or os.getpid())
+
 if __name__ == "__main__":
     celery_app.start() 
\ No newline at end of file
@@ -5,100 +5,314 @@ This module provides utilities for tracking system performance,
 celery task execution, and application statistics.
 """
 
+import atexit
 import logging
-import time
-from functools import wraps
-from typing import Dict, Any, List, Callable, Optional
-from datetime import datetime
+import os
+import threading
+from collections import defaultdict
+from functools import lru_cache, wraps
+from typing import Dict, Any, List, Callable, Optional, Tuple
+from datetime import datetime, timezone
+from time import perf_counter_ns, time
 
-from prometheus_client import Counter, Histogram, Gauge, Summary
-from celery.signals import task_success, task_failure, task_received, task_revoked
+from celery.signals import (
+    task_success, task_failure, task_received, task_revoked, worker_process_shutdown
+)
+
+from src.app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-# Initialize metrics
-TASK_COUNTER = Counter(
-    'celery_tasks_total', 
-    'Number of celery tasks', 
-    ['task_name', 'state']
-)
+# When disabled, every metric is a shared no-op and no signal handlers are
+# connected, so processes that are never scraped skip Prometheus entirely
+METRICS_ENABLED = settings.METRICS_ENABLED
 
-TASK_LATENCY = Histogram(
-    'celery_task_latency_seconds', 
-    'Task execution time in seconds', 
-    ['task_name']
-)
+class _Noop:
+    """
+    Stand-in for a Prometheus metric that ignores every update.
+    """
+    def inc(self, *args, **kwargs) -> None:
+        pass
+        
+    def observe(self, *args, **kwargs) -> None:
+        pass
+        
+    def set(self, *args, **kwargs) -> None:
+        pass
+        
+    def labels(self, *args, **kwargs) -> "_Noop":
+        return self
+
+_NOOP = _Noop()
+
+@lru_cache(maxsize=None)
+def _registry() -> Any:
+    """
+    Get the registry holding the worker's metrics, importing prometheus_client
+    on first use so processes that never record a metric don't load it.
+    
+    The registry is kept separate from the default registry so unrelated
+    collectors are not exported alongside the worker's metrics.
+    
+    Returns:
+        Prometheus CollectorRegistry
+    """
+    from prometheus_client import CollectorRegistry
+    return CollectorRegistry(auto_describe=False)
 
-APP_METRICS = {
-    'profiles_synced': Counter(
+def _prometheus() -> Any:
+    """
+    Import prometheus_client for a metric factory.
+    
+    Returns:
+        The prometheus_client module
+    """
+    import prometheus_client
+    return prometheus_client
+
+# Histogram buckets sized to realistic latency tiers; fewer buckets mean
+# fewer writes per observation and a smaller scrape
+TASK_LATENCY_BUCKETS = (0.05, 0.25, 1.0, 5.0, 30.0, 120.0)
+API_CALL_BUCKETS = (0.25, 1.0, 2.5, 5.0, 15.0, 60.0)
+LLM_RESPONSE_BUCKETS = (1.0, 2.5, 5.0, 10.0, 30.0, 90.0)
+
+# Metric definitions, instantiated on first use
+_METRIC_FACTORIES: Dict[str, Callable[[], Any]] = {
+    'tasks': lambda: _prometheus().Counter(
+        'celery_tasks_total', 
+        'Number of celery tasks', 
+        ['task_name', 'state'],
+        registry=_registry()
+    ),
+    'task_latency': lambda: _prometheus().Histogram(
+        'celery_task_latency_seconds', 
+        'Task execution time in seconds', 
+        ['task_name'],
+        buckets=TASK_LATENCY_BUCKETS,
+        registry=_registry()
+    ),
+    'profiles_synced': lambda: _prometheus().Counter(
         'profiles_synced_total', 
-        'Number of LinkedIn profiles synced'
+        'Number of LinkedIn profiles synced',
+        registry=_registry()
     ),
-    'jobs_found': Counter(
+    'jobs_found': lambda: _prometheus().Counter(
         'jobs_found_total', 
-        'Number of jobs found'
+        'Number of jobs found',
+        registry=_registry()
     ),
-    'applications_submitted': Counter(
+    'applications_submitted': lambda: _prometheus().Counter(
         'applications_submitted_total', 
-        'Number of job applications submitted'
+        'Number of job applications submitted',
+        registry=_registry()
     ),
-    'resumes_generated': Counter(
+    'resumes_generated': lambda: _prometheus().Counter(
         'resumes_generated_total', 
-        'Number of resumes generated'
+        'Number of resumes generated',
+        registry=_registry()
     ),
-    'cover_letters_generated': Counter(
+    'cover_letters_generated': lambda: _prometheus().Counter(
         'cover_letters_generated_total', 
-        'Number of cover letters generated'
+        'Number of cover letters generated',
+        registry=_registry()
     ),
-    'job_search_duration': Histogram(
+    'job_search_duration': lambda: _prometheus().Histogram(
         'job_search_duration_seconds', 
-        'Job search duration in seconds'
+        'Job search duration in seconds',
+        buckets=API_CALL_BUCKETS,
+        registry=_registry()
     ),
-    'profile_sync_duration': Histogram(
+    'profile_sync_duration': lambda: _prometheus().Histogram(
         'profile_sync_duration_seconds', 
-        'Profile sync duration in seconds'
+        'Profile sync duration in seconds',
+        buckets=API_CALL_BUCKETS,
+        registry=_registry()
     ),
-    'llm_response_time': Histogram(
+    'llm_response_time': lambda: _prometheus().Histogram(
         'llm_response_time_seconds', 
-        'LLM response time in seconds'
+        'LLM response time in seconds',
+        buckets=LLM_RESPONSE_BUCKETS,
+        registry=_registry()
     ),
-    'active_users': Gauge(
+    'active_users': lambda: _prometheus().Gauge(
         'active_users', 
-        'Number of active users'
+        'Number of active users',
+        registry=_registry()
     ),
-    'pending_applications': Gauge(
+    'pending_applications': lambda: _prometheus().Gauge(
         'pending_applications', 
-        'Number of pending job applications'
+        'Number of pending job applications',
+        registry=_registry()
     ),
-    'error_rate': Counter(
+    'error_rate': lambda: _prometheus().Counter(
         'error_rate_total', 
         'Number of errors by type',
-        ['error_type', 'task_name']
+        ['error_type', 'task_name'],
+        registry=_registry()
     )
 }
 
+class _LazyMetrics(dict):
+    """
+    Dict of application metrics that creates each metric on first access.
+    """
+    _lock = threading.Lock()
+    
+    def __missing__(self, metric_name: str) -> Any:
+        factory = _METRIC_FACTORIES.get(metric_name)
+        if factory is None:
+            raise KeyError(metric_name)
+        with self._lock:
+            # Another thread may have created it while we waited
+            if metric_name not in self:
+                self[metric_name] = factory() if METRICS_ENABLED else _NOOP
+            return dict.__getitem__(self, metric_name)
+        
+    def get(self, metric_name: str, default: Any = None) -> Any:
+        try:
+            return self[metric_name]
+        except KeyError:
+            return default
+
+APP_METRICS = _LazyMetrics()
+
+# Seconds between flushes of buffered counter increments
+COUNTER_FLUSH_INTERVAL = 1.0
+
+class _ShardedCounter:
+    """
+    In-process buffer for a labelled counter.
+    
+    Increments are summed per label set and pushed to the underlying
+    Prometheus counter by a background thread, so the hot signal handlers
+    only touch a dict instead of the (possibly mmap-backed) metric. The
+    counter itself is only created by the first flush.
+    """
+    def __init__(self, metric_name: str):
+        self._metric_name = metric_name
+        self._reset()
+        
+    def _reset(self) -> None:
+        self._pending: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        
+    def inc(self, labels: Tuple[str, ...], amount: float = 1.0) -> None:
+        _ensure_flusher()
+        with self._lock:
+            self._pending[labels] += amount
+            
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(float)
+        for labels, total in pending.items():
+            child = self._children.get(labels)
+            if child is None:
+                child = APP_METRICS[self._metric_name].labels(*labels)
+                self._children[labels] = child
+            child.inc(total)
+
+_TASK_COUNTS = _ShardedCounter('tasks')
+_ERROR_COUNTS = _ShardedCounter('error_rate')
+_SHARDED_COUNTERS = (_TASK_COUNTS, _ERROR_COUNTS)
+
+# PID that owns the running flush thread; threads do not survive a prefork
+# fork, so each child process starts its own
+_flusher_pid: Optional[int] = None
+_flusher_lock = threading.Lock()
+_flusher_stop = threading.Event()
+
+def flush_counters() -> None:
+    """
+    Push all buffered counter increments to Prometheus.
+    """
+    for counter in _SHARDED_COUNTERS:
+        counter.flush()
+
+def _flush_loop() -> None:
+    while not _flusher_stop.wait(COUNTER_FLUSH_INTERVAL):
+        try:
+            flush_counters()
+        except Exception as e:
+            logger.error("Error flushing metrics: %s", e)
+
+def _ensure_flusher() -> None:
+    global _flusher_pid
+    pid = os.getpid()
+    if _flusher_pid == pid:
+        return
+    with _flusher_lock:
+        if _flusher_pid == pid:
+            return
+        thread = threading.Thread(
+            target=_flush_loop,
+            name="metrics-flusher",
+            daemon=True
+        )
+        thread.start()
+        _flusher_pid = pid
+
+def _reset_after_fork() -> None:
+    """
+    Give a forked child empty buffers and fresh locks.
+    
+    The child would otherwise push the parent's unflushed increments a
+    second time, and could inherit a lock held by the parent's flusher.
+    """
+    global _flusher_pid, _flusher_lock, _flusher_stop
+    for counter in _SHARDED_COUNTERS:
+        counter._reset()
+    _flusher_pid = None
+    _flusher_lock = threading.Lock()
+    _flusher_stop = threading.Event()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+def worker_process_shutdown_handler(**kwargs):
+    _flusher_stop.set()
+    flush_counters()
+
+# Error types reported as their own error_rate label; everything else is
+# bucketed as 'Other' to keep the label cardinality bounded
+_KNOWN_ERRORS = frozenset({
+    'ConnectionError',
+    'Timeout',
+    'HTTPError',
+    'IntegrityError',
+    'OperationalError',
+    'ValueError',
+    'KeyError',
+    'unknown',
+})
+
 # Celery task signal handlers
-@task_received.connect
 def task_received_handler(sender=None, headers=None, body=None, **kwargs):
     task_name = sender.name if sender else 'unknown'
-    TASK_COUNTER.labels(task_name=task_name, state='received').inc()
+    _TASK_COUNTS.inc((task_name, 'received'))
 
-@task_success.connect
 def task_success_handler(sender=None, **kwargs):
     task_name = sender.name if sender else 'unknown'
-    TASK_COUNTER.labels(task_name=task_name, state='success').inc()
+    _TASK_COUNTS.inc((task_name, 'success'))
 
-@task_failure.connect
 def task_failure_handler(sender=None, exception=None, **kwargs):
     task_name = sender.name if sender else 'unknown'
     error_type = type(exception).__name__ if exception else 'unknown'
-    TASK_COUNTER.labels(task_name=task_name, state='failure').inc()
-    APP_METRICS['error_rate'].labels(error_type=error_type, task_name=task_name).inc()
+    if error_type not in _KNOWN_ERRORS:
+        error_type = 'Other'
+    _TASK_COUNTS.inc((task_name, 'failure'))
+    _ERROR_COUNTS.inc((error_type, task_name))
 
-@task_revoked.connect
 def task_revoked_handler(sender=None, **kwargs):
     task_name = sender.name if sender else 'unknown'
-    TASK_COUNTER.labels(task_name=task_name, state='revoked').inc()
+    _TASK_COUNTS.inc((task_name, 'revoked'))
+
+if METRICS_ENABLED:
+    task_received.connect(task_received_handler)
+    task_success.connect(task_success_handler)
+    task_failure.connect(task_failure_handler)
+    task_revoked.connect(task_revoked_handler)
+    worker_process_shutdown.connect(worker_process_shutdown_handler)
+    atexit.register(flush_counters)
 
 def timing_decorator(metric_name: str) -> Callable:
     """
@@ -109,20 +323,24 @@ def timing_decorator(metric_name: str) -> Callable:
         
     Returns:
         Decorator function
+        
+    Raises:
+        ValueError: If the metric name is unknown
     """
+    metric = APP_METRICS.get(metric_name)
+    if metric is None:
+        raise ValueError(f"Unknown metric name: {metric_name}")
+    observe = metric.observe
+
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_ns = perf_counter_ns()
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                execution_time = time.time() - start_time
-                if metric_name in APP_METRICS:
-                    APP_METRICS[metric_name].observe(execution_time)
-                else:
-                    logger.warning(f"Unknown metric name: {metric_name}")
+                observe((perf_counter_ns() - start_ns) * 1e-9)
         return wrapper
     return decorator
 
@@ -136,19 +354,40 @@ class TimingContext:
             # Code to time
     """
     def __init__(self, metric_name: str):
+        metric = APP_METRICS.get(metric_name)
+        if metric is None:
+            raise ValueError(f"Unknown metric name: {metric_name}")
         self.metric_name = metric_name
-        self.start_time = None
+        self._observe = metric.observe
+        self._start_ns = None
         
     def __enter__(self):
-        self.start_time = time.time()
+        self._start_ns = perf_counter_ns()
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
-        execution_time = time.time() - self.start_time
-        if self.metric_name in APP_METRICS:
-            APP_METRICS[self.metric_name].observe(execution_time)
-        else:
-            logger.warning(f"Unknown metric name: {self.metric_name}")
+        self._observe((perf_counter_ns() - self._start_ns) * 1e-9)
+
+@lru_cache(maxsize=64)
+def _resolve_metric_method(metric_name: str, method: str) -> Optional[Callable]:
+    """
+    Resolve a bound metric method once per (metric, method) pair.
+    
+    Args:
+        metric_name: Name of the metric
+        method: Name of the metric method (e.g. 'inc', 'set')
+        
+    Returns:
+        Bound method, or None if the metric is unknown or lacks the method
+    """
+    metric = APP_METRICS.get(metric_name)
+    if metric is None:
+        logger.warning("Unknown metric name: %s", metric_name)
+        return None
+    bound = getattr(metric, method, None)
+    if bound is None:
+        logger.warning("Metric %s does not support %s", metric_name, method)
+    return bound
 
 def track_event(metric_name: str, increment: float = 1.0) -> None:
     """
@@ -158,13 +397,9 @@ def track_event(metric_name: str, increment: float = 1.0) -> None:
         metric_name: Name of the metric to increment
         increment: Value to increment by (default: 1.0)
     """
-    if metric_name in APP_METRICS:
-        if hasattr(APP_METRICS[metric_name], 'inc'):
-            APP_METRICS[metric_name].inc(increment)
-        else:
-            logger.warning(f"Metric {metric_name} does not support increment")
-    else:
-        logger.warning(f"Unknown metric name: {metric_name}")
+    inc = _resolve_metric_method(metric_name, 'inc')
+    if inc is not None:
+        inc(increment)
 
 def set_gauge(metric_name: str, value: float) -> None:
     """
@@ -174,13 +409,9 @@ def set_gauge(metric_name: str, value: float) -> None:
         metric_name: Name of the gauge metric
         value: Value to set
     """
-    if metric_name in APP_METRICS:
-        if hasattr(APP_METRICS[metric_name], 'set'):
-            APP_METRICS[metric_name].set(value)
-        else:
-            logger.warning(f"Metric {metric_name} is not a gauge")
-    else:
-        logger.warning(f"Unknown metric name: {metric_name}")
+    set_value = _resolve_metric_method(metric_name, 'set')
+    if set_value is not None:
+        set_value(value)
 
 def create_task_report() -> Dict[str, Any]:
     """
@@ -192,7 +423,7 @@ def create_task_report() -> Dict[str, Any]:
     # This is a placeholder - in a real implementation, this would
     # query Prometheus or another metrics storage system
     return {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.fromtimestamp(time(), tz=timezone.utc).isoformat(),
         "metrics": {
             "task_count": {
                 "total": 0,  # Would be populated from metrics data
@@ -209,6 +440,13 @@ def create_task_report() -> Dict[str, Any]:
         }
     }
 
+# Counter incremented for each tracked application stage
+_STAGE_COUNTER: Dict[str, str] = {
+    "resume_generated": "resumes_generated",
+    "cover_letter_generated": "cover_letters_generated",
+    "application_submitted": "applications_submitted",
+}
+
 def track_application_progress(user_id: str, job_id: str, stage: str) -> None:
     """
     Track application progress through various stages.
@@ -218,16 +456,13 @@ def track_application_progress(user_id: str, job_id: str, stage: str) -> None:
         job_id: ID of the job
         stage: Stage of the application process
     """
-    logger.info(f"Application progress: User {user_id}, Job {job_id}, Stage: {stage}")
+    logger.info("Application progress: User %s, Job %s, Stage: %s", user_id, job_id, stage)
     # In a real implementation, this might store progress in a database
     # or increment a custom metric with labels
     
-    if stage == "resume_generated":
-        track_event("resumes_generated")
-    elif stage == "cover_letter_generated":
-        track_event("cover_letters_generated")
-    elif stage == "application_submitted":
-        track_event("applications_submitted")
+    metric_name = _STAGE_COUNTER.get(stage)
+    if metric_name is not None:
+        APP_METRICS[metric_name].inc()
 
 def export_metrics_to_file(path: str) -> None:
     """
@@ -238,4 +473,4 @@ def export_metrics_to_file(path: str) -> None:
     """
     # This is a placeholder - in a real implementation, this would
     # export metrics from Prometheus or another metrics system
-    logger.info(f"Exporting metrics to file: {path}") 
\ No newline at end of file
+    logger.info("Exporting metrics to file: %s", path) 
\ No newline at end of file
@@ -3,4 +3,4 @@ Task package for the LinkedIn AI Agent.
 """
 
 # Import tasks to register them with Celery
-from src.worker.tasks import linkedin_tasks, llm_tasks 
\ No newline at end of file
+from src.worker.tasks import linkedin_tasks, llm_tasks, admin 
\ No newline at end of file
@@ -4,10 +4,14 @@ These tasks are typically scheduled to run periodically.
 """
 
 import logging
+import random
+import time
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import or_
+from celery import group
+from sqlalchemy import func, or_, text
+from sqlalchemy.orm import Session
 
 from src.app.db.session import SessionLocal
 from src.app.models.user import User
@@ -15,10 +19,48 @@ from src.app.models.job import Job
 from src.app.models.application import Application, Resume, CoverLetter
 from src.app.services.user import get_users
 from src.worker.main import celery_app
-from src.worker.tasks.linkedin import sync_profile, search_jobs, find_matching_jobs
+from src.worker.tasks.linkedin_tasks import sync_profile, search_jobs, find_matching_jobs
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of signatures published in a single group
+FANOUT_CHUNK_SIZE = 500
+
+# Fan-outs larger than this are spread over FANOUT_SPREAD_SECONDS with a
+# random countdown per group, so the broker and workers are fed gradually
+FANOUT_JITTER_THRESHOLD = 2000
+FANOUT_SPREAD_SECONDS = 60.0
+
+
+def _apply_in_groups(signatures: List[Any]) -> List[str]:
+    """
+    Publish task signatures as groups of at most FANOUT_CHUNK_SIZE.
+    
+    Args:
+        signatures: Task signatures to publish
+        
+    Returns:
+        List of task IDs, in the same order as the signatures
+    """
+    spread = FANOUT_SPREAD_SECONDS if len(signatures) > FANOUT_JITTER_THRESHOLD else 0
+    task_ids = []
+    for start in range(0, len(signatures), FANOUT_CHUNK_SIZE):
+        countdown = random.uniform(0, spread) if spread else None
+        result = group(signatures[start:start + FANOUT_CHUNK_SIZE]).apply_async(countdown=countdown)
+        task_ids.extend(child.id for child in result.children)
+    return task_ids
+
+def _set_read_only(db: Session) -> None:
+    """
+    Mark the session's transaction as read-only.
+    
+    Must run before any other statement in the transaction.
+    
+    Args:
+        db: Database session
+    """
+    db.execute(text("SET TRANSACTION READ ONLY"))
+
 @celery_app.task(bind=True, name="admin.sync_all_profiles")
 def sync_all_profiles(self) -> Dict[str, Any]:
     """
@@ -29,36 +71,38 @@ def sync_all_profiles(self) -> Dict[str, Any]:
     """
     logger.info("Syncing LinkedIn profiles for all users")
     
-    db = SessionLocal()
     try:
-        # Get all users with LinkedIn connected
-        users = db.query(User).filter(User.linkedin_access_token.isnot(None)).all()
+        with SessionLocal() as db:
+            _set_read_only(db)
+
+            # Get the IDs of users with LinkedIn connected
+            user_rows = db.query(User.id).filter(
+                User.linkedin_access_token.isnot(None)
+            ).all()
+            user_ids = [str(row.id) for row in user_rows]
         
-        logger.info(f"Found {len(users)} users with LinkedIn connected")
+            logger.info("Found %d users with LinkedIn connected", len(user_ids))
         
-        # Start sync tasks for each user
-        sync_tasks = []
-        for user in users:
-            task = sync_profile.delay(str(user.id))
-            sync_tasks.append({
-                "user_id": str(user.id),
-                "task_id": task.id
-            })
+            # Start sync tasks for each user
+            task_ids = _apply_in_groups([sync_profile.s(user_id) for user_id in user_ids])
         
-        return {
-            "status": "success",
-            "message": f"Started syncing profiles for {len(sync_tasks)} users",
-            "task_count": len(sync_tasks),
-            "tasks": sync_tasks
-        }
+            sync_tasks = [
+                {"user_id": user_id, "task_id": task_id}
+                for user_id, task_id in zip(user_ids, task_ids)
+            ]
+        
+            return {
+                "status": "success",
+                "message": f"Started syncing profiles for {len(sync_tasks)} users",
+                "task_count": len(sync_tasks),
+                "tasks": sync_tasks
+            }
     except Exception as e:
-        logger.error(f"Error syncing all profiles: {str(e)}")
+        logger.error("Error syncing all profiles: %s", e)
         return {
             "status": "error",
             "message": f"Error syncing all profiles: {str(e)}"
         }
-    finally:
-        db.close()
 
 @celery_app.task(bind=True, name="admin.search_jobs_for_all_users")
 def search_jobs_for_all_users(self) -> Dict[str, Any]:
@@ -70,45 +114,38 @@ def search_jobs_for_all_users(self) -> Dict[str, Any]:
     """
     logger.info("Searching jobs for all users")
     
-    db = SessionLocal()
     try:
-        # Get all users with LinkedIn connected
-        users = db.query(User).filter(User.linkedin_access_token.isnot(None)).all()
+        with SessionLocal() as db:
+            _set_read_only(db)
+
+            # Get the IDs of users with LinkedIn connected
+            user_rows = db.query(User.id).filter(
+                User.linkedin_access_token.isnot(None)
+            ).all()
+            user_ids = [str(row.id) for row in user_rows]
         
-        logger.info(f"Found {len(users)} users with LinkedIn connected")
+            logger.info("Found %d users with LinkedIn connected", len(user_ids))
         
-        # Start job search tasks for each user
-        search_tasks = []
-        for user in users:
-            # Get user's search preferences (could be stored in a separate table)
-            preferences = user.preferences if hasattr(user, "preferences") else {}
-            
-            task = search_jobs.delay(
-                str(user.id),
-                keywords=preferences.get("job_keywords"),
-                location=preferences.get("job_location"),
-                job_type=preferences.get("job_type"),
-                experience_level=preferences.get("experience_level")
-            )
-            search_tasks.append({
-                "user_id": str(user.id),
-                "task_id": task.id
-            })
+            # Start job search tasks for each user
+            task_ids = _apply_in_groups([search_jobs.s(user_id) for user_id in user_ids])
         
-        return {
-            "status": "success",
-            "message": f"Started job search for {len(search_tasks)} users",
-            "task_count": len(search_tasks),
-            "tasks": search_tasks
-        }
+            search_tasks = [
+                {"user_id": user_id, "task_id": task_id}
+                for user_id, task_id in zip(user_ids, task_ids)
+            ]
+        
+            return {
+                "status": "success",
+                "message": f"Started job search for {len(search_tasks)} users",
+                "task_count": len(search_tasks),
+                "tasks": search_tasks
+            }
     except Exception as e:
-        logger.error(f"Error searching jobs for all users: {str(e)}")
+        logger.error("Error searching jobs for all users: %s", e)
         return {
             "status": "error",
             "message": f"Error searching jobs for all users: {str(e)}"
         }
-    finally:
-        db.close()
 
 @celery_app.task(bind=True, name="admin.find_matching_jobs_for_all_users")
 def find_matching_jobs_for_all_users(self) -> Dict[str, Any]:
@@ -120,36 +157,36 @@ def find_matching_jobs_for_all_users(self) -> Dict[str, Any]:
     """
     logger.info("Finding matching jobs for all users")
     
-    db = SessionLocal()
     try:
-        # Get all users with profiles
-        users = db.query(User).all()
+        with SessionLocal() as db:
+            _set_read_only(db)
+
+            # Get the IDs of all users
+            user_rows = db.query(User.id).all()
+            user_ids = [str(row.id) for row in user_rows]
         
-        logger.info(f"Found {len(users)} users")
+            logger.info("Found %d users", len(user_ids))
         
-        # Start matching tasks for each user
-        match_tasks = []
-        for user in users:
-            task = find_matching_jobs.delay(str(user.id))
-            match_tasks.append({
-                "user_id": str(user.id),
-                "task_id": task.id
-            })
+            # Start matching tasks for each user
+            task_ids = _apply_in_groups([find_matching_jobs.s(user_id) for user_id in user_ids])
         
-        return {
-            "status": "success",
-            "message": f"Started finding matching jobs for {len(match_tasks)} users",
-            "task_count": len(match_tasks),
-            "tasks": match_tasks
-        }
+            match_tasks = [
+                {"user_id": user_id, "task_id": task_id}
+                for user_id, task_id in zip(user_ids, task_ids)
+            ]
+        
+            return {
+                "status": "success",
+                "message": f"Started finding matching jobs for {len(match_tasks)} users",
+                "task_count": len(match_tasks),
+                "tasks": match_tasks
+            }
     except Exception as e:
-        logger.error(f"Error finding matching jobs for all users: {str(e)}")
+        logger.error("Error finding matching jobs for all users: %s", e)
         return {
             "status": "error",
             "message": f"Error finding matching jobs for all users: {str(e)}"
         }
-    finally:
-        db.close()
 
 @celery_app.task(bind=True, name="admin.cleanup_old_data")
 def cleanup_old_data(self, days: int = 90) -> Dict[str, Any]:
@@ -162,78 +199,54 @@ def cleanup_old_data(self, days: int = 90) -> Dict[str, Any]:
     Returns:
         Dict containing the result of the cleanup operation
     """
-    logger.info(f"Cleaning up data older than {days} days")
+    logger.info("Cleaning up data older than %s days", days)
+    now = datetime.fromtimestamp(time.time(), tz=timezone.utc)
     
-    db = SessionLocal()
     try:
-        # Calculate cutoff date
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        # Delete old jobs
-        old_jobs = db.query(Job).filter(
-            or_(
-                Job.created_at < cutoff_date,
-                Job.last_updated < cutoff_date
-            )
-        ).all()
-        
-        job_ids = [str(job.id) for job in old_jobs]
-        
-        # Delete old applications
-        old_applications = db.query(Application).filter(
-            or_(
-                Application.created_at < cutoff_date,
-                Application.last_updated < cutoff_date
-            )
-        ).all()
-        
-        application_ids = [str(app.id) for app in old_applications]
-        
-        # Delete old resumes
-        old_resumes = db.query(Resume).filter(
-            Resume.created_at < cutoff_date
-        ).all()
-        
-        resume_ids = [str(resume.id) for resume in old_resumes]
+        with SessionLocal() as db:
+            # Calculate cutoff date; the timestamp columns hold naive UTC
+            cutoff_date = now.replace(tzinfo=None) - timedelta(days=days)
         
-        # Delete old cover letters
-        old_cover_letters = db.query(CoverLetter).filter(
-            CoverLetter.created_at < cutoff_date
-        ).all()
+            # Delete with one bulk DELETE per table, children before jobs, and
+            # commit once so the cleanup stays a single transaction
+            deleted_applications = db.query(Application).filter(
+                or_(
+                    Application.created_at < cutoff_date,
+                    Application.updated_at < cutoff_date
+                )
+            ).delete(synchronize_session=False)
         
-        cover_letter_ids = [str(cl.id) for cl in old_cover_letters]
+            deleted_resumes = db.query(Resume).filter(
+                Resume.created_at < cutoff_date
+            ).delete(synchronize_session=False)
         
-        # Delete all at once
-        for application in old_applications:
-            db.delete(application)
+            deleted_cover_letters = db.query(CoverLetter).filter(
+                CoverLetter.created_at < cutoff_date
+            ).delete(synchronize_session=False)
         
-        for resume in old_resumes:
-            db.delete(resume)
+            deleted_jobs = db.query(Job).filter(
+                or_(
+                    Job.created_at < cutoff_date,
+                    Job.updated_at < cutoff_date
+                )
+            ).delete(synchronize_session=False)
         
-        for cover_letter in old_cover_letters:
-            db.delete(cover_letter)
+            db.commit()
         
-        for job in old_jobs:
-            db.delete(job)
-        
-        db.commit()
-        
-        return {
-            "status": "success",
-            "message": f"Cleaned up data older than {days} days",
-            "deleted_jobs": len(job_ids),
-            "deleted_applications": len(application_ids),
-            "deleted_resumes": len(resume_ids),
-            "deleted_cover_letters": len(cover_letter_ids)
-        }
+            return {
+                "status": "success",
+                "message": f"Cleaned up data older than {days} days",
+                "deleted_jobs": deleted_jobs,
+                "deleted_applications": deleted_applications,
+                "deleted_resumes": deleted_resumes,
+                "deleted_cover_letters": deleted_cover_letters
+            }
     except Exception as e:
-        logger.error(f"Error cleaning up old data: {str(e)}")
+        logger.error("Error cleaning up old data: %s", e)
         return {
             "status": "error",
             "message": f"Error cleaning up old data: {str(e)}"
         }
-    finally:
-        db.close()
 
 @celery_app.task(bind=True, name="admin.generate_activity_report")
 def generate_activity_report(self, days: int = 7) -> Dict[str, Any]:
@@ -246,55 +259,51 @@ def generate_activity_report(self, days: int = 7) -> Dict[str, Any]:
     Returns:
         Dict containing the activity report
     """
-    logger.info(f"Generating activity report for the last {days} days")
+    logger.info("Generating activity report for the last %s days", days)
+    now = datetime.fromtimestamp(time.time(), tz=timezone.utc)
     
-    db = SessionLocal()
     try:
-        # Calculate cutoff date
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        # Count recent jobs
-        recent_jobs_count = db.query(Job).filter(
-            Job.created_at >= cutoff_date
-        ).count()
-        
-        # Count recent applications
-        recent_applications_count = db.query(Application).filter(
-            Application.created_at >= cutoff_date
-        ).count()
-        
-        # Count recent users
-        recent_users_count = db.query(User).filter(
-            User.created_at >= cutoff_date
-        ).count()
-        
-        # Count submitted applications
-        submitted_applications_count = db.query(Application).filter(
-            Application.status == "submitted",
-            Application.submitted_at >= cutoff_date
-        ).count()
+        with SessionLocal() as db:
+            _set_read_only(db)
+
+            # Calculate cutoff date; the timestamp columns hold naive UTC
+            cutoff_date = now.replace(tzinfo=None) - timedelta(days=days)
         
-        # Count users with LinkedIn connected
-        linkedin_users_count = db.query(User).filter(
-            User.linkedin_access_token.isnot(None)
-        ).count()
+            # Compute every count as a scalar subquery of a single SELECT so the
+            # report costs one round trip
+            counts = db.query(
+                db.query(func.count(Job.id)).filter(
+                    Job.created_at >= cutoff_date
+                ).scalar_subquery().label("recent_jobs"),
+                db.query(func.count(Application.id)).filter(
+                    Application.created_at >= cutoff_date
+                ).scalar_subquery().label("recent_applications"),
+                db.query(func.count(User.id)).filter(
+                    User.created_at >= cutoff_date
+                ).scalar_subquery().label("recent_users"),
+                db.query(func.count(Application.id)).filter(
+                    Application.status == "submitted",
+                    Application.application_date >= cutoff_date
+                ).scalar_subquery().label("submitted_applications"),
+                db.query(func.count(User.id)).filter(
+                    User.linkedin_access_token.isnot(None)
+                ).scalar_subquery().label("linkedin_users"),
+            ).one()
         
-        return {
-            "status": "success",
-            "message": f"Generated activity report for the last {days} days",
-            "period_days": days,
-            "recent_jobs": recent_jobs_count,
-            "recent_applications": recent_applications_count,
-            "recent_users": recent_users_count,
-            "submitted_applications": submitted_applications_count,
-            "linkedin_users": linkedin_users_count,
-            "generated_at": datetime.utcnow().isoformat()
-        }
+            return {
+                "status": "success",
+                "message": f"Generated activity report for the last {days} days",
+                "period_days": days,
+                "recent_jobs": counts.recent_jobs,
+                "recent_applications": counts.recent_applications,
+                "recent_users": counts.recent_users,
+                "submitted_applications": counts.submitted_applications,
+                "linkedin_users": counts.linkedin_users,
+                "generated_at": now.isoformat()
+            }
     except Exception as e:
-        logger.error(f"Error generating activity report: {str(e)}")
+        logger.error("Error generating activity report: %s", e)
         return {
             "status": "error",
             "message": f"Error generating activity report: {str(e)}"
         }
-    finally:
-        db.close() 
\ No newline at end of file
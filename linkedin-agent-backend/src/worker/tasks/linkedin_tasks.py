@@ -3,26 +3,38 @@ LinkedIn-related Celery tasks for the LinkedIn AI Agent.
 """
 
 import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 from typing import Dict, Any, Optional, List
-from datetime import datetime
 
-from sqlalchemy.orm import Session
+import redis
+from celery import group
 
-from src.app.core.linkedin_client import LinkedInClient, get_linkedin_client
-from src.app.db.session import SessionLocal
-from src.app.models.user import User
-from src.app.models.profile import Profile, Experience, Education, Certification, Skill
-from src.app.models.job import Job
-from src.app.services.user import get_user, update_user
-from src.app.services.profile import create_profile, update_profile, get_profile_by_user
-from src.app.services.job import create_job, update_job, get_job_by_linkedin_id
-from src.app.services.linkedin import get_linkedin_service
+from src.app.core.cache import redis_client
+from src.app.db.session import WorkerSession
+from src.app.models.profile import Profile
+from src.app.services.user import get_user
+from src.app.services.automation import get_automation_service
+from src.app.services.profile import PROFILE_RELATION_LOADS
+from src.app.services.linkedin import LinkedInTokenRefreshPending, get_linkedin_service
 from src.app.services.vector_store import get_vector_store_service
 from src.worker.main import celery_app
 
 logger = logging.getLogger(__name__)
 
-@celery_app.task(bind=True, name="linkedin.sync_profile")
+# Maximum number of connection pages fetched from LinkedIn at once
+CONNECTION_FETCH_CONCURRENCY = 8
+
+# Seconds before retrying a task that found another task refreshing the
+# user's LinkedIn token; with the default three retries this outlasts the
+# refresh lock's timeout
+TOKEN_REFRESH_RETRY_COUNTDOWN = 10
+
+# Seconds a submitted application blocks repeat submissions of the same job
+APPLY_DEDUP_TTL = 60
+
+@celery_app.task(bind=True, name="linkedin.sync_profile", ignore_result=True, acks_late=False)
 def sync_profile(self, user_id: str) -> Dict[str, Any]:
     """
     Synchronize a user's LinkedIn profile data.
@@ -33,9 +45,9 @@ def sync_profile(self, user_id: str) -> Dict[str, Any]:
     Returns:
         Dict containing the result of the sync operation
     """
-    logger.info(f"Syncing LinkedIn profile for user {user_id}")
+    logger.info("Syncing LinkedIn profile for user %s", user_id)
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
         # Get user
         user = get_user(db, user_id=user_id)
@@ -50,24 +62,82 @@ def sync_profile(self, user_id: str) -> Dict[str, Any]:
         linkedin_service = get_linkedin_service(db)
         result = linkedin_service.sync_profile(user)
         
-        # If profile sync was successful, index profile in vector store
-        if result.get("status") == "success" and result.get("profile_id"):
-            profile_id = result.get("profile_id")
-            profile = db.query(Profile).filter(Profile.id == profile_id).first()
-            if profile:
-                vector_store = get_vector_store_service(db)
-                vector_store.index_profile(profile)
+        # If profile sync was successful, index the profile on the
+        # embeddings queue so a slow embedding call doesn't hold this slot
+        if result.ok:
+            index_profile_task.delay(str(result.profile.id))
         
-        return result
+        return result.to_dict()
+    except LinkedInTokenRefreshPending as e:
+        raise self.retry(exc=e, countdown=TOKEN_REFRESH_RETRY_COUNTDOWN)
     except Exception as e:
-        logger.error(f"Error syncing LinkedIn profile: {str(e)}")
+        logger.error("Error syncing LinkedIn profile: %s", e)
         return {
             "status": "error",
             "user_id": user_id,
             "message": f"Error syncing LinkedIn profile: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
+
+@celery_app.task(bind=True, name="linkedin.index_profile", ignore_result=True)
+def index_profile_task(self, profile_id: str) -> Dict[str, Any]:
+    """
+    Index a profile in the vector store.
+    
+    Args:
+        profile_id: The ID of the profile to index
+        
+    Returns:
+        Dict containing the result of the indexing operation
+    """
+    logger.info("Indexing profile %s in vector store", profile_id)
+    
+    db = WorkerSession()
+    try:
+        profile = db.query(Profile).options(*PROFILE_RELATION_LOADS).filter(
+            Profile.id == profile_id
+        ).first()
+        if not profile:
+            return {
+                "status": "error",
+                "profile_id": profile_id,
+                "message": "Profile not found"
+            }
+        
+        # Re-syncs that didn't change the indexed content skip the embedding
+        vector_store = get_vector_store_service(db)
+        content_hash = vector_store.profile_content_hash(profile)
+        if profile.content_hash == content_hash:
+            return {
+                "status": "skipped",
+                "profile_id": profile_id,
+                "message": "Profile unchanged since last indexed"
+            }
+        
+        if not vector_store.index_profile(profile):
+            return {
+                "status": "error",
+                "profile_id": profile_id,
+                "message": "Error indexing profile"
+            }
+        
+        profile.content_hash = content_hash
+        db.commit()
+        
+        return {
+            "status": "success",
+            "profile_id": profile_id
+        }
+    except Exception as e:
+        logger.error("Error indexing profile: %s", e)
+        return {
+            "status": "error",
+            "profile_id": profile_id,
+            "message": f"Error indexing profile: {str(e)}"
+        }
+    finally:
+        WorkerSession.remove()
 
 @celery_app.task(bind=True, name="linkedin.sync_connections")
 def sync_connections(self, user_id: str) -> Dict[str, Any]:
@@ -80,9 +150,9 @@ def sync_connections(self, user_id: str) -> Dict[str, Any]:
     Returns:
         Dict containing the result of the sync operation
     """
-    logger.info(f"Syncing LinkedIn connections for user {user_id}")
+    logger.info("Syncing LinkedIn connections for user %s", user_id)
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
         # Get user
         user = get_user(db, user_id=user_id)
@@ -96,26 +166,57 @@ def sync_connections(self, user_id: str) -> Dict[str, Any]:
         # Use the LinkedIn service to get connections
         linkedin_service = get_linkedin_service(db)
         
-        # Get first page of connections
-        page = 1
+        # Get first page of connections; it also refreshes the token if
+        # needed, so the remaining pages can be fetched concurrently
         limit = 100
-        total_connections = []
+        result = linkedin_service.get_connections(user, page=1, limit=limit)
+        if result.get("status") != "success":
+            return result
         
-        while True:
-            result = linkedin_service.get_connections(user, page=page, limit=limit)
-            
-            if result.get("status") != "success":
-                return result
+        total_connections = list(result.get("connections", []))
+        
+        # Only fetch further pages when the first one says there are more
+        next_start = result.get("next_start")
+        if next_start is not None:
+            # Read the token and user ID here; the page fetches must not touch
+            # the Session or the ORM user, which aren't thread-safe
+            access_token = linkedin_service.get_valid_access_token(user)
+            if not access_token:
+                return {
+                    "status": "error",
+                    "user_id": user_id,
+                    "message": "Could not obtain valid LinkedIn access token"
+                }
+            user_key = user.id
             
-            connections = result.get("connections", [])
-            total_connections.extend(connections)
+            def fetch_page(page: int) -> Dict[str, Any]:
+                return linkedin_service.fetch_connections_page(
+                    access_token, user_key, page=page, limit=limit
+                )
             
-            # If we got fewer connections than the limit, we've reached the end
-            if len(connections) < limit:
-                break
+            if result.get("total"):
+                num_pages = math.ceil(result["total"] / limit)
+                with ThreadPoolExecutor(
+                    max_workers=max(1, min(CONNECTION_FETCH_CONCURRENCY, num_pages - 1))
+                ) as executor:
+                    page_results = list(executor.map(fetch_page, range(2, num_pages + 1)))
+            else:
+                # Without a total the page count is unknown, so follow
+                # next_start one page at a time
+                page_results = []
+                page = 2
+                while next_start is not None:
+                    page_result = fetch_page(page)
+                    page_results.append(page_result)
+                    if page_result.get("status") != "success":
+                        break
+                    next_start = page_result.get("next_start")
+                    page += 1
             
-            # Get next page
-            page += 1
+            for page_result in page_results:
+                if page_result.get("status") != "success":
+                    return page_result
+                total_connections.extend(page_result.get("connections", []))
         
         return {
             "status": "success",
@@ -123,17 +224,19 @@ def sync_connections(self, user_id: str) -> Dict[str, Any]:
             "count": len(total_connections),
             "message": f"Successfully synced {len(total_connections)} connections"
         }
+    except LinkedInTokenRefreshPending as e:
+        raise self.retry(exc=e, countdown=TOKEN_REFRESH_RETRY_COUNTDOWN)
     except Exception as e:
-        logger.error(f"Error syncing LinkedIn connections: {str(e)}")
+        logger.error("Error syncing LinkedIn connections: %s", e)
         return {
             "status": "error",
             "user_id": user_id,
             "message": f"Error syncing LinkedIn connections: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
-@celery_app.task(bind=True, name="linkedin.search_jobs")
+@celery_app.task(bind=True, name="linkedin.search_jobs", ignore_result=True, acks_late=False)
 def search_jobs(
     self, 
     user_id: str, 
@@ -157,9 +260,9 @@ def search_jobs(
     Returns:
         Dict containing the job search results
     """
-    logger.info(f"Searching LinkedIn jobs for user {user_id}")
+    logger.info("Searching LinkedIn jobs for user %s", user_id)
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
         # Get user
         user = get_user(db, user_id=user_id)
@@ -186,23 +289,24 @@ def search_jobs(
             vector_store = get_vector_store_service(db)
             jobs = result.get("jobs", [])
             
-            # Index each job
-            for job_data in jobs:
-                job_id = job_data.get("id")
-                job = db.query(Job).filter(Job.id == job_id).first()
-                if job:
-                    vector_store.index_job(job)
+            # The returned jobs already carry the columns written by the
+            # upsert, so index them without reloading from the database
+            vector_store.index_jobs(
+                [SimpleNamespace(**job_data) for job_data in jobs if job_data.get("id")]
+            )
         
         return result
+    except LinkedInTokenRefreshPending as e:
+        raise self.retry(exc=e, countdown=TOKEN_REFRESH_RETRY_COUNTDOWN)
     except Exception as e:
-        logger.error(f"Error searching LinkedIn jobs: {str(e)}")
+        logger.error("Error searching LinkedIn jobs: %s", e)
         return {
             "status": "error",
             "user_id": user_id,
             "message": f"Error searching LinkedIn jobs: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
 @celery_app.task(bind=True, name="linkedin.find_matching_jobs")
 def find_matching_jobs(self, user_id: str, limit: int = 20) -> Dict[str, Any]:
@@ -216,9 +320,9 @@ def find_matching_jobs(self, user_id: str, limit: int = 20) -> Dict[str, Any]:
     Returns:
         Dict containing matching jobs with scores
     """
-    logger.info(f"Finding matching jobs for user {user_id}")
+    logger.info("Finding matching jobs for user %s", user_id)
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
         # Check if user exists
         user = get_user(db, user_id=user_id)
@@ -230,35 +334,41 @@ def find_matching_jobs(self, user_id: str, limit: int = 20) -> Dict[str, Any]:
             }
         
         # Use automation service to find matching jobs
-        from src.app.services.automation import get_automation_service
         automation_service = get_automation_service(db)
         
         result = automation_service.find_matching_jobs(user_id=user_id, limit=limit)
         return result
     except Exception as e:
-        logger.error(f"Error finding matching jobs: {str(e)}")
+        logger.error("Error finding matching jobs: %s", e)
         return {
             "status": "error",
             "user_id": user_id,
             "message": f"Error finding matching jobs: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
 @celery_app.task(bind=True, name="linkedin.bulk_index_jobs")
-def bulk_index_jobs(self) -> Dict[str, Any]:
+def bulk_index_jobs(self, rebuild_index: bool = False) -> Dict[str, Any]:
     """
     Index all jobs in the vector store.
     
+    Args:
+        rebuild_index: Rebuild the job vectors in a fresh namespace, dropping
+            the vectors of deleted jobs
+        
     Returns:
         Dict containing the result of the indexing operation
     """
     logger.info("Indexing all jobs in vector store")
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
         vector_store = get_vector_store_service(db)
-        success_count, total_count = vector_store.reindex_all_jobs()
+        if rebuild_index:
+            success_count, total_count = vector_store.bulk_reindex_all_jobs()
+        else:
+            success_count, total_count = vector_store.reindex_all_jobs()
         
         return {
             "status": "success",
@@ -267,13 +377,13 @@ def bulk_index_jobs(self) -> Dict[str, Any]:
             "message": f"Successfully indexed {success_count}/{total_count} jobs"
         }
     except Exception as e:
-        logger.error(f"Error indexing jobs: {str(e)}")
+        logger.error("Error indexing jobs: %s", e)
         return {
             "status": "error",
             "message": f"Error indexing jobs: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
 @celery_app.task(bind=True, name="linkedin.bulk_index_profiles")
 def bulk_index_profiles(self) -> Dict[str, Any]:
@@ -285,7 +395,7 @@ def bulk_index_profiles(self) -> Dict[str, Any]:
     """
     logger.info("Indexing all profiles in vector store")
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
         vector_store = get_vector_store_service(db)
         success_count, total_count = vector_store.reindex_all_profiles()
@@ -297,15 +407,15 @@ def bulk_index_profiles(self) -> Dict[str, Any]:
             "message": f"Successfully indexed {success_count}/{total_count} profiles"
         }
     except Exception as e:
-        logger.error(f"Error indexing profiles: {str(e)}")
+        logger.error("Error indexing profiles: %s", e)
         return {
             "status": "error",
             "message": f"Error indexing profiles: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
-@celery_app.task(bind=True, name="linkedin.apply_to_job")
+@celery_app.task(bind=True, name="linkedin.apply_to_job", ignore_result=True, acks_late=False)
 def apply_to_job(
     self, 
     user_id: str, 
@@ -325,13 +435,31 @@ def apply_to_job(
     Returns:
         Dict containing the result of the application
     """
-    logger.info(f"Applying to job {job_id} for user {user_id}")
+    logger.info("Applying to job %s for user %s", job_id, user_id)
+    
+    # Drop repeat submissions of the same application (retries, double
+    # clicks) before touching the database. The guard is best effort: if
+    # Redis is unavailable the application goes ahead unguarded.
+    dedup_key = f"apply:{user_id}:{job_id}"
+    try:
+        is_duplicate = not redis_client.set(dedup_key, "1", nx=True, ex=APPLY_DEDUP_TTL)
+    except redis.RedisError as e:
+        logger.warning("Failed to take application guard %s: %s", dedup_key, e)
+        is_duplicate = False
+    if is_duplicate:
+        return {
+            "status": "duplicate",
+            "user_id": user_id,
+            "job_id": job_id,
+            "message": "An application to this job is already in progress"
+        }
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
         # Get user
         user = get_user(db, user_id=user_id)
         if not user or not user.linkedin_access_token:
+            _release_apply_guard(dedup_key)
             return {
                 "status": "error",
                 "user_id": user_id,
@@ -347,9 +475,18 @@ def apply_to_job(
             cover_letter_id=cover_letter_id
         )
         
+        # Only a successful application keeps the guard; a failed attempt
+        # may be retried straight away
+        if result.get("status") != "success":
+            _release_apply_guard(dedup_key)
+        
         return result
+    except LinkedInTokenRefreshPending as e:
+        _release_apply_guard(dedup_key)
+        raise self.retry(exc=e, countdown=TOKEN_REFRESH_RETRY_COUNTDOWN)
     except Exception as e:
-        logger.error(f"Error applying to job: {str(e)}")
+        logger.error("Error applying to job: %s", e)
+        _release_apply_guard(dedup_key)
         return {
             "status": "error",
             "user_id": user_id,
@@ -357,4 +494,43 @@ def apply_to_job(
             "message": f"Error applying to job: {str(e)}"
         }
     finally:
-        db.close() 
\ No newline at end of file
+        WorkerSession.remove()
+
+def _release_apply_guard(dedup_key: str) -> None:
+    """
+    Drop an application's repeat-submission guard so it can be retried.
+    
+    Args:
+        dedup_key: Redis key of the guard
+    """
+    try:
+        redis_client.delete(dedup_key)
+    except redis.RedisError as e:
+        logger.warning("Failed to release application guard %s: %s", dedup_key, e)
+
+def apply_to_jobs_bulk(
+    user_id: str,
+    job_ids: List[str],
+    resume_id: Optional[str] = None,
+    cover_letter_id: Optional[str] = None
+) -> List[str]:
+    """
+    Queue applications to several jobs for a user as a single group.
+    
+    Args:
+        user_id: The ID of the user applying to the jobs
+        job_ids: The IDs of the jobs to apply to
+        resume_id: The ID of the resume to use
+        cover_letter_id: The ID of the cover letter to use
+        
+    Returns:
+        List of task IDs, in the same order as the job IDs
+    """
+    if not job_ids:
+        return []
+    
+    result = group(
+        apply_to_job.s(user_id, job_id, resume_id=resume_id, cover_letter_id=cover_letter_id)
+        for job_id in job_ids
+    ).apply_async()
+    return [child.id for child in result.children]
@@ -3,22 +3,62 @@ LLM-related Celery tasks for the LinkedIn AI Agent.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 
-from src.app.db.session import SessionLocal
+import orjson
+import redis
+from celery import group
+from sqlalchemy import JSON, cast, column, func, update, values
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from src.app.core.async_llm_client import get_async_llm_client, run_async
+from src.app.core.cache import get_loop_redis_client, redis_client, single_flight
+from src.app.core.config import settings
+from src.app.core.llm_client import LLMRateLimitError
+from src.app.db.session import WorkerSession
 from src.app.models.user import User
 from src.app.models.profile import Profile
 from src.app.models.job import Job
 from src.app.services.user import get_user
-from src.app.services.profile import get_profile_by_user, update_profile
-from src.app.services.job import get_job
-from src.app.services.llm import get_llm_service
+from src.app.services.profile import (
+    PROFILE_RELATION_LOADS,
+    get_profile_by_user_id,
+    get_profile_data_versions,
+    get_profiles_by_user_ids,
+)
+from src.app.services.job import get_job_fields
+from src.app.services.llm import LLMService, get_llm_service
 from src.app.services.automation import get_automation_service
 from src.worker.main import celery_app
 
 logger = logging.getLogger(__name__)
 
-@celery_app.task(bind=True, name="llm.analyze_profile")
+# Retry options for tasks that call the LLM directly; requests rejected by
+# the provider's rate limit are retried with exponential backoff
+LLM_RETRY_OPTIONS = {
+    "autoretry_for": (LLMRateLimitError,),
+    "retry_backoff": True,
+    "retry_backoff_max": 30,
+}
+
+# Redis pub/sub channel generate_message streams its output to. Subscribers
+# receive {"type": "text", "text": ...} events, then a {"type": "done"} event.
+MESSAGE_STREAM_CHANNEL = "msg:{task_id}"
+
+# Cached _create_profiles_data output, keyed on the profile's ID and data
+# version, so a profile update makes a new key instead of invalidating
+PROFILE_DATA_CACHE_KEY = "pd:{profile_id}:{version}"
+PROFILE_DATA_CACHE_TTL = 86400
+
+# Relationships loaded by PROFILE_RELATION_LOADS and read by _build_profile_data
+PROFILE_RELATIONS = frozenset({"user", "experiences", "educations", "certifications"})
+
+@celery_app.task(
+    bind=True, name="llm.analyze_profile", rate_limit=settings.LLM_TASK_RATE_LIMIT, **LLM_RETRY_OPTIONS
+)
+@single_flight(lambda args: f"analyze:{args['user_id']}")
 def analyze_profile(self, user_id: str) -> Dict[str, Any]:
     """
     Analyze a LinkedIn profile using LLM.
@@ -31,10 +71,11 @@ def analyze_profile(self, user_id: str) -> Dict[str, Any]:
     """
     logger.info(f"Analyzing LinkedIn profile for user {user_id}")
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
-        # Get profile
-        profile = get_profile_by_user(db, user_id=user_id)
+        # Get profile; its relationships are only loaded if the profile
+        # data isn't cached
+        profile = get_profile_by_user_id(db, user_id=user_id)
         if not profile:
             return {
                 "status": "error",
@@ -43,17 +84,20 @@ def analyze_profile(self, user_id: str) -> Dict[str, Any]:
             }
         
         # Create profile data
-        profile_data = _create_profile_data(profile)
+        profile_data = _create_profiles_data(db, [profile])[0]
         
-        # Use LLM service for analysis
+        # Use LLM service for analysis, requesting its parts concurrently
         llm_service = get_llm_service(db)
-        analysis = llm_service.analyze_profile(profile_data)
+        analysis = run_async(_analyze_profile(llm_service, profile_data))
         
-        # Update profile with analysis
-        update_profile(db, profile=profile, profile_in={
-            "analysis": analysis,
-            "analyzed_at": "NOW()"
-        })
+        # Update profile with analysis, without reloading it
+        db.execute(
+            update(Profile)
+            .where(Profile.id == profile.id)
+            .values(analysis=analysis, analyzed_at=func.timezone("utc", func.now()))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
         
         return {
             "status": "success",
@@ -62,6 +106,8 @@ def analyze_profile(self, user_id: str) -> Dict[str, Any]:
             "analysis": analysis,
             "message": "Profile analyzed successfully"
         }
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         logger.error(f"Error analyzing profile: {str(e)}")
         return {
@@ -70,9 +116,138 @@ def analyze_profile(self, user_id: str) -> Dict[str, Any]:
             "message": f"Error analyzing profile: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
-@celery_app.task(bind=True, name="llm.match_job")
+@celery_app.task(
+    bind=True, name="llm.analyze_profiles_bulk", rate_limit=settings.LLM_TASK_RATE_LIMIT
+)
+def analyze_profiles_bulk(self, user_ids: List[str], attempt: int = 0) -> Dict[str, Any]:
+    """
+    Analyze the LinkedIn profiles of several users in one task.
+    
+    The profiles are loaded with a single query, analyzed concurrently and
+    the successful analyses written back in one transaction. At most
+    settings.LLM_BULK_MAX_PROFILES user IDs are accepted per task.
+    
+    The task's rate_limit counts tasks, not profiles, so one task sends the
+    requests for all of its profiles at once. Rate limiting is handled per
+    profile instead: the users whose analysis the provider rejected are
+    re-enqueued in a new task with exponential backoff, and the rest of the
+    batch is kept.
+    
+    Args:
+        user_ids: The IDs of the users whose profiles to analyze
+        attempt: How many times these users have been re-enqueued after
+            being rate limited
+        
+    Returns:
+        Dict containing the analysis result for each user
+    """
+    if len(user_ids) > settings.LLM_BULK_MAX_PROFILES:
+        return {
+            "status": "error",
+            "message": (
+                f"Too many profiles: {len(user_ids)} given, "
+                f"at most {settings.LLM_BULK_MAX_PROFILES} allowed"
+            )
+        }
+    
+    logger.info(f"Analyzing LinkedIn profiles for {len(user_ids)} users")
+    
+    db = WorkerSession()
+    try:
+        # Related rows are only loaded for the profiles whose data isn't cached
+        profiles = db.query(Profile).filter(Profile.user_id.in_(user_ids)).all()
+        
+        llm_service = get_llm_service(db)
+        analyses = run_async(_analyze_profiles(
+            llm_service, _create_profiles_data(db, profiles)
+        ))
+        
+        # Re-enqueue only the rate-limited users, after a backoff
+        rate_limited = [
+            str(profile.user_id)
+            for profile, analysis in zip(profiles, analyses)
+            if isinstance(analysis, LLMRateLimitError)
+        ]
+        retry_task_id = None
+        if rate_limited and attempt < self.max_retries:
+            retry_task_id = self.apply_async(
+                args=(rate_limited,),
+                kwargs={"attempt": attempt + 1},
+                countdown=min(2 ** attempt, LLM_RETRY_OPTIONS["retry_backoff_max"]),
+            ).id
+            logger.warning(
+                f"Re-enqueued {len(rate_limited)} rate-limited profiles as task {retry_task_id}"
+            )
+        
+        # Write every successful analysis with one UPDATE ... FROM (VALUES ...)
+        rows = [
+            (profile.id, analysis)
+            for profile, analysis in zip(profiles, analyses)
+            if isinstance(analysis, dict) and analysis.get("status") != "error"
+        ]
+        if rows:
+            analyzed = values(
+                column("id", UUID(as_uuid=True)), column("analysis", JSON), name="analyzed"
+            ).data(rows)
+            db.execute(
+                update(Profile)
+                .where(Profile.id == cast(analyzed.c.id, UUID(as_uuid=True)))
+                .values(
+                    analysis=cast(analyzed.c.analysis, JSON),
+                    analyzed_at=func.timezone("utc", func.now())
+                )
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        
+        results = {}
+        for profile, analysis in zip(profiles, analyses):
+            if isinstance(analysis, LLMRateLimitError) and retry_task_id:
+                results[str(profile.user_id)] = {
+                    "status": "retrying",
+                    "profile_id": str(profile.id),
+                    "task_id": retry_task_id
+                }
+            elif isinstance(analysis, BaseException):
+                results[str(profile.user_id)] = {
+                    "status": "error",
+                    "profile_id": str(profile.id),
+                    "message": f"Error analyzing profile: {str(analysis)}"
+                }
+            else:
+                results[str(profile.user_id)] = {
+                    "status": "error" if analysis.get("status") == "error" else "success",
+                    "profile_id": str(profile.id),
+                    "analysis": analysis
+                }
+        for user_id in user_ids:
+            results.setdefault(str(user_id), {
+                "status": "error",
+                "message": "Profile not found"
+            })
+        
+        return {
+            "status": "success",
+            "count": len(profiles),
+            "results": results,
+            "message": f"Analyzed {len(profiles)} profiles"
+        }
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error analyzing profiles: {str(e)}")
+        return {
+            "status": "error",
+            "message": f"Error analyzing profiles: {str(e)}"
+        }
+    finally:
+        WorkerSession.remove()
+
+@celery_app.task(
+    bind=True, name="llm.match_job", rate_limit=settings.LLM_TASK_RATE_LIMIT, **LLM_RETRY_OPTIONS
+)
+@single_flight(lambda args: f"match:{args['user_id']}:{args['job_id']}")
 def match_job(self, user_id: str, job_id: str) -> Dict[str, Any]:
     """
     Match a profile to a job using LLM.
@@ -86,10 +261,16 @@ def match_job(self, user_id: str, job_id: str) -> Dict[str, Any]:
     """
     logger.info(f"Matching user {user_id} to job {job_id}")
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
-        # Get profile
-        profile = get_profile_by_user(db, user_id=user_id)
+        # Get the LLM service first; the first task in a process creates the
+        # shared client, which connects to the provider while the profile
+        # and job are read
+        llm_service = get_llm_service(db)
+        
+        # Get profile; its relationships are only loaded if the profile
+        # data isn't cached
+        profile = get_profile_by_user_id(db, user_id=user_id)
         if not profile:
             return {
                 "status": "error",
@@ -99,8 +280,8 @@ def match_job(self, user_id: str, job_id: str) -> Dict[str, Any]:
             }
         
         # Get job
-        job = get_job(db, job_id=job_id)
-        if not job:
+        job_fields = get_job_fields(db, job_id=job_id)
+        if not job_fields:
             return {
                 "status": "error",
                 "user_id": user_id,
@@ -109,19 +290,12 @@ def match_job(self, user_id: str, job_id: str) -> Dict[str, Any]:
             }
         
         # Create profile data
-        profile_data = _create_profile_data(profile)
+        profile_data = _create_profiles_data(db, [profile])[0]
         
         # Create job data
-        job_data = {
-            "id": job.id,
-            "title": job.title,
-            "company": job.company,
-            "location": job.location,
-            "description": job.description
-        }
+        job_data = job_fields._asdict()
         
         # Use LLM service for job matching
-        llm_service = get_llm_service(db)
         match_result = llm_service.match_job(profile_data, job_data)
         
         return {
@@ -131,6 +305,8 @@ def match_job(self, user_id: str, job_id: str) -> Dict[str, Any]:
             "match_result": match_result,
             "message": "Job match completed successfully"
         }
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         logger.error(f"Error matching job: {str(e)}")
         return {
@@ -140,9 +316,29 @@ def match_job(self, user_id: str, job_id: str) -> Dict[str, Any]:
             "message": f"Error matching job: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
-@celery_app.task(bind=True, name="llm.generate_cover_letter")
+def enqueue_match_jobs(pairs: List[Tuple[str, str]]) -> List[str]:
+    """
+    Queue job matches for many (user, job) pairs.
+    
+    Each pair is matched by its own llm.match_job task, so the tasks keep
+    their routing, rate limit and retries. The tasks are published together
+    as a group over one producer connection.
+    
+    Args:
+        pairs: (user ID, job ID) pairs to match
+        
+    Returns:
+        List of task IDs, one per pair
+    """
+    if not pairs:
+        return []
+    
+    result = group(match_job.s(user_id, job_id) for user_id, job_id in pairs).apply_async()
+    return [child.id for child in result.children]
+
+@celery_app.task(bind=True, name="llm.generate_cover_letter", rate_limit=settings.LLM_TASK_RATE_LIMIT)
 def generate_cover_letter(
     self, 
     user_id: str, 
@@ -164,7 +360,7 @@ def generate_cover_letter(
     """
     logger.info(f"Generating cover letter for user {user_id} and job {job_id}")
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
         # Use automation service to generate cover letter
         automation_service = get_automation_service(db)
@@ -185,9 +381,9 @@ def generate_cover_letter(
             "message": f"Error generating cover letter: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
-@celery_app.task(bind=True, name="llm.generate_resume")
+@celery_app.task(bind=True, name="llm.generate_resume", rate_limit=settings.LLM_TASK_RATE_LIMIT)
 def generate_resume(
     self, 
     user_id: str, 
@@ -207,7 +403,7 @@ def generate_resume(
     """
     logger.info(f"Generating resume for user {user_id} and job {job_id}")
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
         # Use automation service to generate resume
         automation_service = get_automation_service(db)
@@ -227,9 +423,11 @@ def generate_resume(
             "message": f"Error generating resume: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
-@celery_app.task(bind=True, name="llm.generate_message")
+@celery_app.task(
+    bind=True, name="llm.generate_message", rate_limit=settings.LLM_TASK_RATE_LIMIT, **LLM_RETRY_OPTIONS
+)
 def generate_message(
     self, 
     user_id: str,
@@ -251,10 +449,12 @@ def generate_message(
     """
     logger.info(f"Generating {message_type} message for user {user_id} to recipient {recipient_id}")
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
-        # Get sender profile
-        sender_profile = get_profile_by_user(db, user_id=user_id)
+        # Get sender and recipient profiles with one query
+        profiles = get_profiles_by_user_ids(db, [user_id, recipient_id])
+        
+        sender_profile = profiles.get(str(user_id))
         if not sender_profile:
             return {
                 "status": "error",
@@ -263,8 +463,7 @@ def generate_message(
                 "message": "Sender profile not found"
             }
         
-        # Get recipient profile
-        recipient_profile = get_profile_by_user(db, user_id=recipient_id)
+        recipient_profile = profiles.get(str(recipient_id))
         if not recipient_profile:
             return {
                 "status": "error",
@@ -273,20 +472,22 @@ def generate_message(
                 "message": "Recipient profile not found"
             }
         
-        # Create sender data
-        sender_data = _create_profile_data(sender_profile)
-        
-        # Create recipient data
-        recipient_data = _create_profile_data(recipient_profile)
+        # Create sender and recipient data
+        sender_data, recipient_data = _create_profiles_data(
+            db, [sender_profile, recipient_profile]
+        )
         
-        # Use LLM service to generate message
+        # Use LLM service to generate message, publishing the text to the
+        # task's channel as it streams in
         llm_service = get_llm_service(db)
-        message = llm_service.generate_message(
+        message = run_async(_generate_message_stream(
+            llm_service,
+            MESSAGE_STREAM_CHANNEL.format(task_id=self.request.id),
             sender_data=sender_data,
             recipient_data=recipient_data,
             context=context,
             message_type=message_type
-        )
+        ))
         
         return {
             "status": "success",
@@ -296,6 +497,8 @@ def generate_message(
             "generated_message": message,
             "message": "Message generated successfully"
         }
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         logger.error(f"Error generating message: {str(e)}")
         return {
@@ -305,9 +508,11 @@ def generate_message(
             "message": f"Error generating message: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
 
-@celery_app.task(bind=True, name="llm.prepare_interview")
+@celery_app.task(
+    bind=True, name="llm.prepare_interview", rate_limit=settings.LLM_TASK_RATE_LIMIT, **LLM_RETRY_OPTIONS
+)
 def prepare_interview(
     self, 
     user_id: str, 
@@ -327,10 +532,16 @@ def prepare_interview(
     """
     logger.info(f"Preparing {interview_type} interview for user {user_id} and job {job_id}")
     
-    db = SessionLocal()
+    db = WorkerSession()
     try:
-        # Get profile
-        profile = get_profile_by_user(db, user_id=user_id)
+        # Get the LLM service first; the first task in a process creates the
+        # shared client, which connects to the provider while the profile
+        # and job are read
+        llm_service = get_llm_service(db)
+        
+        # Get profile; its relationships are only loaded if the profile
+        # data isn't cached
+        profile = get_profile_by_user_id(db, user_id=user_id)
         if not profile:
             return {
                 "status": "error",
@@ -340,8 +551,8 @@ def prepare_interview(
             }
         
         # Get job
-        job = get_job(db, job_id=job_id)
-        if not job:
+        job_fields = get_job_fields(db, job_id=job_id)
+        if not job_fields:
             return {
                 "status": "error",
                 "user_id": user_id,
@@ -350,19 +561,12 @@ def prepare_interview(
             }
         
         # Create profile data
-        profile_data = _create_profile_data(profile)
+        profile_data = _create_profiles_data(db, [profile])[0]
         
         # Create job data
-        job_data = {
-            "id": job.id,
-            "title": job.title,
-            "company": job.company,
-            "location": job.location,
-            "description": job.description
-        }
+        job_data = job_fields._asdict()
         
         # Use LLM service to prepare interview
-        llm_service = get_llm_service(db)
         interview_prep = llm_service.prepare_interview(
             profile_data=profile_data,
             job_data=job_data,
@@ -377,6 +581,8 @@ def prepare_interview(
             "interview_prep": interview_prep,
             "message": "Interview preparation completed successfully"
         }
+    except LLMRateLimitError:
+        raise
     except Exception as e:
         logger.error(f"Error preparing interview: {str(e)}")
         return {
@@ -386,11 +592,152 @@ def prepare_interview(
             "message": f"Error preparing interview: {str(e)}"
         }
     finally:
-        db.close()
+        WorkerSession.remove()
+
+async def _analyze_profile(llm_service: LLMService, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a profile analysis on the current event loop's async LLM client.
+    
+    Args:
+        llm_service: LLM service
+        profile_data: Profile data
+        
+    Returns:
+        Analysis results
+    """
+    return await llm_service.analyze_profile_async(profile_data, get_async_llm_client())
+
+async def _analyze_profiles(
+    llm_service: LLMService, profiles_data: List[Dict[str, Any]]
+) -> List[Union[Dict[str, Any], BaseException]]:
+    """
+    Run several profile analyses on the current event loop's async LLM
+    client.
+    
+    Args:
+        llm_service: LLM service
+        profiles_data: Profile data for each profile
+        
+    Returns:
+        Analysis results or exceptions, in the same order as the profiles
+    """
+    return await llm_service.analyze_profiles_async(profiles_data, get_async_llm_client())
+
+async def _generate_message_stream(
+    llm_service: LLMService, channel: str, **kwargs: Any
+) -> Dict[str, Any]:
+    """
+    Generate a message on the current event loop's async LLM client,
+    publishing the response text to a Redis channel as it arrives.
+    
+    Publishing is best effort; a Redis error doesn't fail the generation.
+    
+    Args:
+        llm_service: LLM service
+        channel: Redis pub/sub channel to publish to
+        kwargs: Arguments for LLMService.generate_message_stream
+        
+    Returns:
+        Generated message
+    """
+    publisher = get_loop_redis_client()
+    
+    async def publish(event: Dict[str, Any]) -> None:
+        try:
+            await publisher.publish(channel, orjson.dumps(event))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to publish to {channel}: {str(e)}")
+    
+    message = await llm_service.generate_message_stream(
+        client=get_async_llm_client(),
+        on_text=lambda text: publish({"type": "text", "text": text}),
+        **kwargs
+    )
+    await publish({"type": "done"})
+    return message
+
+def _create_profiles_data(db: Session, profiles: List[Profile]) -> List[Dict[str, Any]]:
+    """
+    Create the dictionary representations of several profiles, cached in
+    Redis per profile data version.
+    
+    The cached representations are read with one MGET. Only the profiles
+    that miss the cache have their user and related rows loaded, with
+    PROFILE_RELATION_LOADS, before their representations are built and
+    cached.
+    
+    The representations are always returned as decoded from JSON, so cache
+    hits and misses produce identical prompts.
+    
+    Args:
+        db: Database session
+        profiles: Profile objects
+        
+    Returns:
+        Dictionary representations, in the order of profiles
+    """
+    versions = get_profile_data_versions(db, [profile.id for profile in profiles])
+    keys = [
+        PROFILE_DATA_CACHE_KEY.format(profile_id=profile.id, version=versions[str(profile.id)])
+        if str(profile.id) in versions else None
+        for profile in profiles
+    ]
+    
+    cached: List[Optional[bytes]] = [None] * len(profiles)
+    cache_keys = [key for key in keys if key is not None]
+    if cache_keys:
+        try:
+            hits = dict(zip(cache_keys, redis_client.mget(cache_keys)))
+            cached = [hits.get(key) if key is not None else None for key in keys]
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read cached profile data: {str(e)}")
+    
+    _load_profile_relations(db, [
+        profile for profile, payload in zip(profiles, cached) if payload is None
+    ])
+    
+    results = []
+    to_cache = {}
+    for profile, key, payload in zip(profiles, keys, cached):
+        if payload is None:
+            payload = orjson.dumps(_build_profile_data(profile), default=str)
+            if key is not None:
+                to_cache[key] = payload
+        results.append(orjson.loads(payload))
+    
+    if to_cache:
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for key, payload in to_cache.items():
+                pipe.setex(key, PROFILE_DATA_CACHE_TTL, payload)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to cache profile data: {str(e)}")
+    
+    return results
 
-def _create_profile_data(profile: Profile) -> Dict[str, Any]:
+def _load_profile_relations(db: Session, profiles: List[Profile]) -> None:
     """
-    Create a dictionary representation of a profile.
+    Load the user and related rows of profiles with PROFILE_RELATION_LOADS,
+    skipping the profiles that already have them loaded.
+    
+    Args:
+        db: Database session
+        profiles: Profile objects
+    """
+    unloaded = [
+        profile.id for profile in profiles
+        if not sa_inspect(profile).unloaded.isdisjoint(PROFILE_RELATIONS)
+    ]
+    if unloaded:
+        db.query(Profile).options(*PROFILE_RELATION_LOADS).populate_existing().filter(
+            Profile.id.in_(unloaded)
+        ).all()
+
+def _build_profile_data(profile: Profile) -> Dict[str, Any]:
+    """
+    Build the dictionary representation of a profile from its user and
+    related rows.
     
     Args:
         profile: Profile object
@@ -414,8 +761,8 @@ def _create_profile_data(profile: Profile) -> Dict[str, Any]:
     
     # Get education
     education = []
-    if hasattr(profile, "education") and profile.education:
-        for edu in profile.education:
+    if hasattr(profile, "educations") and profile.educations:
+        for edu in profile.educations:
             education.append({
                 "school": edu.school,
                 "degree": edu.degree,
@@ -425,14 +772,8 @@ def _create_profile_data(profile: Profile) -> Dict[str, Any]:
                 "description": edu.description
             })
     
-    # Get skills
-    skills = []
-    if hasattr(profile, "skills") and profile.skills:
-        for skill in profile.skills:
-            skills.append({
-                "name": skill.name,
-                "endorsements": skill.endorsements
-            })
+    # Get skills; stored as a column on the profile row, so no query is needed
+    skills = list(profile.skills or [])
     
     # Get certifications
     certifications = []
@@ -450,12 +791,11 @@ def _create_profile_data(profile: Profile) -> Dict[str, Any]:
     return {
         "id": profile.id,
         "user_id": profile.user_id,
-        "full_name": profile.full_name,
+        "full_name": profile.user.full_name if profile.user else None,
         "headline": profile.headline,
         "summary": profile.summary,
-        "profile_picture_url": profile.profile_picture_url,
-        "linkedin_profile_url": profile.linkedin_profile_url,
-        "linkedin_id": profile.linkedin_id,
+        "linkedin_profile_url": profile.public_profile_url,
+        "linkedin_id": profile.linkedin_profile_id,
         "experiences": experiences,
         "education": education,
         "skills": skills,